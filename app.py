@@ -9,8 +9,11 @@ from tkinter.scrolledtext import ScrolledText
 import nltk
 from nltk.corpus import words
 
-# Download NLTK word list
-nltk.download('words')
+# Download NLTK word list (only the first time, not on every launch)
+try:
+    nltk.data.find('corpora/words')
+except LookupError:
+    nltk.download('words')
 
 # Optimize word lookup
 word_set = set(words.words()) 
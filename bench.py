@@ -0,0 +1,361 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Command-line, timing and output modules
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+# Peak memory (not available on Windows)
+try:
+     import resource
+except ImportError:
+     resource = None
+
+# Headless spell checker parts
+from checker import Checker, file_path, load_dictionary, load_filipino_word_list
+from levenshtein import Suggester
+from symspell import SymSpellIndex
+from tokenizer import normalize_word, tokenize
+from worker import CheckWorker
+
+## ============================================================ ## SYNTHETIC TEXT ## ============================================================ ##
+# Misspell method
+def misspell(word, rng):
+     """Apply one random edit (delete, insert, substitute or transpose) to a word."""
+     letters = "abcdefghijklmnopqrstuvwxyz"
+     i = rng.randrange(len(word))
+     edit = rng.randrange(4)
+     if edit == 0 and len(word) > 1:
+          return word[:i] + word[i + 1:]
+     if edit == 1:
+          return word[:i] + rng.choice(letters) + word[i:]
+     if edit == 3 and i + 1 < len(word):
+          return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+     return word[:i] + rng.choice(letters) + word[i + 1:]
+
+# Make corpus method
+def make_corpus(words, token_count, misspell_rate, seed=0, words_per_line=12):
+     """Return (text, misspelled words) built from dictionary words with a controlled misspelling rate."""
+     rng = random.Random(seed)
+     # Zipf-like weights so common words repeat the way they do in real text
+     weights = [1.0 / (rank + 1) for rank in range(len(words))]
+     chosen = rng.choices(words, weights=weights, k=token_count)
+     misspelled = []
+     for i, word in enumerate(chosen):
+          if rng.random() < misspell_rate:
+               chosen[i] = misspell(word, rng)
+               misspelled.append(chosen[i])
+     lines = [" ".join(chosen[i:i + words_per_line]) for i in range(0, token_count, words_per_line)]
+     return "\n".join(lines), misspelled
+
+## ============================================================ ## HELPERS ## ============================================================ ##
+# Percentile method
+def percentile(values, fraction):
+     ordered = sorted(values)
+     if not ordered:
+          return 0.0
+     return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+# Peak RSS method
+def peak_rss_mb():
+     if resource is None:
+          return None
+     # ru_maxrss is in kilobytes on Linux and bytes on macOS
+     scale = 1 if sys.platform == "darwin" else 1024
+     return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / (1 << 20)
+
+# Git revision method
+def git_revision():
+     try:
+          return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+     except OSError:
+          return None
+
+## ============================================================ ## HEADLESS BENCHMARKS ## ============================================================ ##
+# Dictionary load benchmark
+def bench_load(dictionary):
+     started = time.perf_counter()
+     load_filipino_word_list(dictionary)
+     compile_ms = (time.perf_counter() - started) * 1000
+
+     load_dictionary(dictionary)  # Make sure the image exists and is current
+     started = time.perf_counter()
+     lexicon = load_dictionary(dictionary)
+     image_ms = (time.perf_counter() - started) * 1000
+     return lexicon, {"compile_ms": compile_ms, "image_load_ms": image_ms,
+                      "words": len(lexicon), "table_bytes": lexicon.nbytes()}
+
+# Tokenization benchmark
+def bench_tokenize(text):
+     started = time.perf_counter()
+     count = sum(1 for _ in tokenize(text))
+     elapsed = time.perf_counter() - started
+     return {"tokens": count, "tokens_per_sec": count / elapsed}
+
+# Lookup benchmark
+def bench_lookup(lexicon, text):
+     """StartState's rule (normalize, then look up) without and with the result cache."""
+     tokens = text.split()
+     started = time.perf_counter()
+     for word in tokens:
+          normalize_word(word) in lexicon
+     uncached = len(tokens) / (time.perf_counter() - started)
+
+     checker = Checker(lexicon)
+     started = time.perf_counter()
+     for result in checker.check_text(text):
+          pass
+     cached = len(tokens) / (time.perf_counter() - started)
+     return {"uncached_tokens_per_sec": uncached, "checker_tokens_per_sec": cached,
+             "cache": checker.cache.stats()["forms"]}
+
+# Suggestion benchmark
+def bench_suggest(suggester, misspelled, sample_size, seed=0):
+     sample = random.Random(seed).sample(misspelled, min(sample_size, len(misspelled)))
+     latencies = []
+     for word in sample:
+          started = time.perf_counter()
+          suggester.suggest(normalize_word(word), n=5)
+          latencies.append((time.perf_counter() - started) * 1000)
+     return {"queries": len(sample), "p50_ms": percentile(latencies, 0.50),
+             "p99_ms": percentile(latencies, 0.99), "max_ms": max(latencies, default=0.0)}
+
+# SymSpell index benchmark
+def bench_symspell(lexicon, misspelled, sample_size, prefix_length, seed=0):
+     started = time.perf_counter()
+     index = SymSpellIndex.build(lexicon, prefix_length=prefix_length)
+     build_ms = (time.perf_counter() - started) * 1000
+     results = bench_suggest(index, misspelled, sample_size, seed)
+     results.update({"prefix_length": prefix_length, "build_ms": build_ms, "index_bytes": index.nbytes()})
+     return results
+
+## ============================================================ ## GUI BENCHMARKS ## ============================================================ ##
+# Virtual display stand-in for the input CTkTextbox: holds the text and counts Tk calls
+class VirtualText:
+     # Constructor
+     def __init__(self):
+          self.content = ""
+          self.modified = False
+          self.insert_offset = 0
+          self.calls = 0
+          self.tk = self  # Batched tag commands go through tk.call
+          self._w = ".text"
+
+     # Set text method
+     def set_text(self, content):
+          self.content = content
+          self.insert_offset = len(content)
+          self.modified = True
+
+     # Edit modified method
+     def edit_modified(self, arg=None):
+          self.calls += 1
+          if arg is None:
+               return self.modified
+          self.modified = bool(arg)
+
+     # Get method
+     def get(self, start, end):
+          self.calls += 1
+          if start == "1.0" and end in ("end-1c", "end"):
+               return self.content
+          line_start = self.content.rfind("\n", 0, self.insert_offset - 1) + 1
+          return self.content[line_start:self.insert_offset - 1]
+
+     # Index method
+     def index(self, index):
+          self.calls += 1
+          if index.startswith("@"):
+               # A 30-line window scrolled to the top, 20 pixels per line
+               return f"{1 + int(index.split(',')[1]) // 20}.0"
+          offset = self.insert_offset - 1
+          line = self.content.count("\n", 0, offset) + 1
+          return f"{line}.{offset - self.content.rfind(chr(10), 0, offset) - 1}"
+
+     # Window height method
+     def winfo_height(self):
+          self.calls += 1
+          return 580
+
+     # Tag methods
+     def tag_add(self, *args):
+          self.calls += 1
+
+     def tag_remove(self, *args):
+          self.calls += 1
+
+     def tag_config(self, *args, **kwargs):
+          self.calls += 1
+
+     # Tcl call method
+     def call(self, *args):
+          self.calls += 1
+
+     # After method (the benchmark drives the loop itself)
+     def after(self, ms, callback=None, *args):
+          self.calls += 1
+
+# Runs worker requests inline so GUI timings are deterministic
+class InlineWorker(CheckWorker):
+     # Constructor (no thread: each poll produces the next result, like one after() tick)
+     def __init__(self, app, part_lines=100, margin=50):
+          self.app = app
+          self.tracker = app.tracker
+          self.is_valid = app.is_valid
+          self.context = app.check_context
+          self.part_lines = part_lines
+          self.margin = margin
+          self.viewport = (1, 1)
+          self.latest = {"check": 0, "suggest": 0}
+          self.lock = threading.Lock()
+          self.running = iter(())
+          self.busy = False
+
+     # Submit method
+     def submit(self, kind, payload):
+          self.latest[kind] += 1
+          self.running = self._check(self.latest[kind], payload)
+          self.busy = True
+
+     # Commit method
+     def commit(self, region):
+          self.tracker.commit(region)
+
+     # Poll method
+     def poll(self):
+          result = next(self.running, None)
+          if result is None or result[2]:
+               self.busy = False
+          return [] if result is None else [("check", result)]
+
+     # Pending method
+     def pending(self):
+          return self.busy
+
+# GUI benchmark method
+def bench_gui(text):
+     """Time automatic_check/monitor_edits and manual_check against a virtual text widget."""
+     try:
+          import spellchecker
+     except ImportError as e:
+          return {"skipped": f"GUI modules unavailable ({e})"}
+     from document import DocumentState
+     from highlight import HighlightLayer
+     from incremental import DirtyRegionTracker
+
+     app = spellchecker.SpellChecker.__new__(spellchecker.SpellChecker)
+     app.input_text = VirtualText()
+     app.fsm = spellchecker.FSM()
+     app.fsm.set_text_widget(app.input_text)
+     app.tracker = DirtyRegionTracker(spellchecker.word_cache.normalized)
+     app.highlights = HighlightLayer(app.input_text)
+     app.context_highlights = HighlightLayer(app.input_text, "context")
+     app.document = DocumentState(spellchecker.word_set.base)
+     app.monitoring = True
+     app.worker = InlineWorker(app)
+
+     class KeyEvent:
+          keysym = "space"
+
+     results = {}
+
+     # Paste the whole document: the visible lines are highlighted by the first poll, the rest by later ones
+     app.input_text.set_text(text)
+     started = time.perf_counter()
+     app.automatic_check(KeyEvent())
+     app.poll_results()
+     results["paste_first_screen_ms"] = (time.perf_counter() - started) * 1000
+     while app.worker.pending():
+          app.poll_results()
+     results["paste_ms"] = (time.perf_counter() - started) * 1000
+     results["paste_tk_calls"] = app.input_text.calls
+     results["document_tokens"] = len(app.document)
+     results["document_bytes"] = app.document.nbytes()
+
+     # A monitor tick with nothing changed
+     app.input_text.calls = 0
+     started = time.perf_counter()
+     for _ in range(100):
+          app.monitor_edits()
+     results["idle_tick_ms"] = (time.perf_counter() - started) * 1000 / 100
+
+     # A one-word edit in the middle of the document
+     middle = len(text) // 2
+     app.input_text.set_text(text[:middle] + "x" + text[middle:])
+     app.input_text.calls = 0
+     started = time.perf_counter()
+     app.monitor_edits()
+     app.poll_results()
+     results["edit_tick_ms"] = (time.perf_counter() - started) * 1000
+     results["edit_tk_calls"] = app.input_text.calls
+
+     # Manual mode: a space typed after the last word
+     app.input_text.set_text(text + " ")
+     started = time.perf_counter()
+     for _ in range(100):
+          app.manual_check(KeyEvent())
+     results["manual_keystroke_ms"] = (time.perf_counter() - started) * 1000 / 100
+     return results
+
+## ============================================================ ## COMMAND LINE ## ============================================================ ##
+# Argument parser method
+def build_parser():
+     parser = argparse.ArgumentParser(description="Benchmark lookup, suggestion, tokenization and GUI-update paths.")
+     parser.add_argument("--dictionary", default=file_path, help="word list to benchmark against")
+     parser.add_argument("--tokens", type=int, default=200000, help="tokens of synthetic text")
+     parser.add_argument("--misspell-rate", type=float, default=0.05, help="fraction of misspelled tokens")
+     parser.add_argument("--suggestions", type=int, default=200, help="suggestion queries to time")
+     parser.add_argument("--prefix-length", type=int, default=10, help="prefix length of the SymSpell index")
+     parser.add_argument("--seed", type=int, default=0, help="random seed for the synthetic text")
+     parser.add_argument("--skip-gui", action="store_true", help="skip the GUI-update benchmarks")
+     parser.add_argument("--output", default="bench_results.json", help="where to save the JSON results")
+     parser.add_argument("--compare", help="earlier results file to compare against")
+     return parser
+
+# Compare method
+def compare(current, previous, prefix=""):
+     """Print every numeric metric next to its value in an earlier run."""
+     for key, value in current.items():
+          old = previous.get(key) if isinstance(previous, dict) else None
+          if isinstance(value, dict):
+               compare(value, old, f"{prefix}{key}.")
+          elif isinstance(value, (int, float)) and not isinstance(value, bool) and isinstance(old, (int, float)) and old:
+               print(f"{prefix}{key}: {old:.4g} -> {value:.4g} ({value / old:.2f}x)")
+
+# Main method
+def main(argv=None):
+     args = build_parser().parse_args(argv)
+     lexicon, load = bench_load(args.dictionary)
+     words = list(lexicon)
+     text, misspelled = make_corpus(words, args.tokens, args.misspell_rate, args.seed)
+
+     results = {
+          "revision": git_revision(),
+          "python": sys.version.split()[0],
+          "config": {"tokens": args.tokens, "misspell_rate": args.misspell_rate, "seed": args.seed},
+          "load": load,
+          "tokenize": bench_tokenize(text),
+          "lookup": bench_lookup(lexicon, text),
+          "suggest": bench_suggest(Suggester(lexicon), misspelled, args.suggestions, args.seed),
+          "suggest_symspell": bench_symspell(lexicon, misspelled, args.suggestions, args.prefix_length, args.seed),
+     }
+     if not args.skip_gui:
+          results["gui"] = bench_gui(text)
+     results["peak_rss_mb"] = peak_rss_mb()
+
+     print(json.dumps(results, indent=2))
+     with open(args.output, "w", encoding="utf-8") as file:
+          json.dump(results, file, indent=2)
+     if args.compare:
+          with open(args.compare, "r", encoding="utf-8") as file:
+               compare(results, json.load(file))
+     return 0
+
+## ============================================================ ## RUN THE BENCHMARKS ## ============================================================ ##
+if __name__ == "__main__":
+     sys.exit(main())
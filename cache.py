@@ -0,0 +1,158 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Ordered dictionary for LRU bookkeeping
+from collections import OrderedDict
+
+# Lock so the GUI thread and the check worker can share one cache
+import threading
+
+# Marker for a cache miss (None is a valid cached value)
+MISSING = object()
+
+## ============================================================ ## LRU CACHE CLASS ## ============================================================ ##
+# Bounded mapping that evicts the least recently used entry, with hit/miss/eviction counters
+class LRUCache:
+     # Constructor
+     def __init__(self, maxsize=10000):
+          self.maxsize = maxsize
+          self.data = OrderedDict()
+          self.lock = threading.Lock()
+          self.hits = 0
+          self.misses = 0
+          self.evictions = 0
+
+     # Get method
+     def get(self, key):
+          """Return the cached value, or MISSING."""
+          with self.lock:
+               value = self.data.get(key, MISSING)
+               if value is MISSING:
+                    self.misses += 1
+               else:
+                    self.hits += 1
+                    self.data.move_to_end(key)
+               return value
+
+     # Put method
+     def put(self, key, value):
+          with self.lock:
+               self.data[key] = value
+               self.data.move_to_end(key)
+               while len(self.data) > self.maxsize:
+                    self.data.popitem(last=False)
+                    self.evictions += 1
+
+     # Clear method
+     def clear(self):
+          with self.lock:
+               self.data.clear()
+
+     # Length method
+     def __len__(self):
+          return len(self.data)
+
+     # Stats method
+     def stats(self):
+          lookups = self.hits + self.misses
+          return {
+               "size": len(self.data),
+               "maxsize": self.maxsize,
+               "hits": self.hits,
+               "misses": self.misses,
+               "evictions": self.evictions,
+               "hit_rate": self.hits / lookups if lookups else 0.0,
+          }
+
+## ============================================================ ## WORD CACHE CLASS ## ============================================================ ##
+# Cache layer in front of normalization, validation and suggestions
+#
+#   entries: normalized word -> [normalized word, valid, suggestions]
+#   forms:   raw token -> the same entry, so a token seen before costs one lookup
+#            and no fold (str.translate) pass
+# Suggestions are filled in the first time they are requested.
+class WordCache:
+     # Constructor
+     def __init__(self, lexicon, normalize, suggest, maxsize=10000):
+          self.lexicon = lexicon
+          self.normalize = normalize
+          self.suggest = suggest  # normalized word -> list of suggestions
+          self.forms = LRUCache(maxsize)
+          self.entries = LRUCache(maxsize)
+          self.suggestion_hits = 0
+          self.suggestion_misses = 0
+          self.generation = 0  # Bumped by invalidate()
+
+     # Entry method
+     def _entry(self, word):
+          entry = self.forms.get(word)
+          if entry is MISSING:
+               generation = self.generation
+               clean_word = self.normalize(word)
+               entry = self.entries.get(clean_word)
+               if entry is MISSING:
+                    entry = [clean_word, clean_word in self.lexicon, None]
+                    # A result computed against a lexicon that was swapped meanwhile is not kept
+                    if generation == self.generation:
+                         self.entries.put(clean_word, entry)
+               if generation == self.generation:
+                    self.forms.put(word, entry)
+          return entry
+
+     # Normalized method
+     def normalized(self, word):
+          return self._entry(word)[0]
+
+     # Is valid method
+     def is_valid(self, word):
+          return self._entry(word)[1]
+
+     # Suggestions method
+     def suggestions(self, word):
+          entry = self._entry(word)
+          if entry[2] is None:
+               self.suggestion_misses += 1
+               entry[2] = self.suggest(entry[0])
+          else:
+               self.suggestion_hits += 1
+          return entry[2]
+
+     # Cached suggestions method
+     def cached_suggestions(self, word):
+          """Return the cached suggestions for a word, or None if they have not been computed yet."""
+          suggestions = self._entry(word)[2]
+          if suggestions is None:
+               self.suggestion_misses += 1
+          else:
+               self.suggestion_hits += 1
+          return suggestions
+
+     # Store suggestions method
+     def store_suggestions(self, word, suggestions, generation=None):
+          """Cache suggestions computed elsewhere (e.g. in a worker process).
+
+          Pass the generation read before they were computed: if the cache was
+          invalidated meanwhile (a dictionary reload), they are dropped."""
+          if generation is not None and generation != self.generation:
+               return
+          self._entry(word)[2] = suggestions
+
+     # Invalidate method
+     def invalidate(self, lexicon=None):
+          """Forget every cached result, e.g. after the dictionary is reloaded or a word is added."""
+          if lexicon is not None:
+               self.lexicon = lexicon
+          self.generation += 1
+          self.forms.clear()
+          self.entries.clear()
+
+     # Stats method
+     def stats(self):
+          requests = self.suggestion_hits + self.suggestion_misses
+          return {
+               "forms": self.forms.stats(),
+               "entries": self.entries.stats(),
+               "suggestions": {
+                    "hits": self.suggestion_hits,
+                    "misses": self.suggestion_misses,
+                    "hit_rate": self.suggestion_hits / requests if requests else 0.0,
+               },
+          }
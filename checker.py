@@ -0,0 +1,456 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Command-line and output modules
+import argparse
+import json
+import sys
+import time
+
+# Checksum module for the compiled dictionary image
+import hashlib
+
+# os module to ensure that the program can access the filipino_dict.txt file
+import os
+
+# Minimal word automaton used as the lexicon
+from dawg import DAWG
+
+# Suggestion engine (Levenshtein automaton over the lexicon)
+from levenshtein import Suggester
+
+# Symmetric-delete suggestion backend (precomputed index)
+from symspell import SymSpellIndex
+
+# Unigram frequencies for noisy-channel ranking
+from frequency import default_table_path, load_frequencies
+
+# Bigram/trigram model for real-word errors (built offline with ngram.py)
+from ngram import default_model_path, load_ngram_model, sentences
+
+# Personal word list layered over the dictionary
+from lexicon import LayeredLexicon, PersonalWordList, default_personal_path
+
+# Morphological analyzer for affixed and reduplicated forms
+from morphology import MorphologyAnalyzer
+
+# LRU cache for normalization, validation and suggestion results
+from cache import WordCache
+
+# Per-stage timers (off unless enabled)
+from profiling import profiler
+
+# Shared tokenizer and cleaning rule
+from tokenizer import fold_aliases, normalize_word, tokenize, tokenize_stream
+
+# Storing the file path of the filipino words list
+file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "filipino_dict.txt")
+
+# Extra word lists picked up from the dictionary's folder, layered over it in this order
+LAYER_FILES = (("english", "english_dict.txt"), ("domain", "domain_terms.txt"))
+
+# Layer paths method
+def layer_paths(file_path):
+     """Return (name, path) for the Tagalog word list and every extra word list found next to it."""
+     folder = os.path.dirname(file_path)
+     layers = [("tagalog", file_path)]
+     for name, file_name in LAYER_FILES:
+          path = os.path.join(folder, file_name)
+          if path != file_path and os.path.exists(path):
+               layers.append((name, path))
+     return layers
+
+# Layers digest method
+def layers_digest(digests):
+     """Combine the SHA-256 of every layer file into one (a single list keeps its own digest)."""
+     if len(digests) == 1:
+          return digests[0]
+     return hashlib.sha256(b"".join(digests)).digest()
+
+# Loading the file (and any extra layers) and compiling it into a minimal DAWG
+def load_filipino_word_list(file_path):
+     """Compile the word list and the extra layers next to it into one DAWG.
+
+     Each word records the layers that list it as a bitmask, so a word in
+     several lists is stored once and one walk answers for every layer. Words
+     whose folded key differs from their spelling (biñan, ako’y) get an alias,
+     so the key typed any way finds them."""
+     masks = {}
+     size = mtime = 0
+     digests = []
+     layers = layer_paths(file_path)
+     for bit, (name, path) in enumerate(layers):
+          try:
+               with open(path, "rb") as file:
+                    data = file.read()
+                    stat = os.fstat(file.fileno())
+          except FileNotFoundError:
+               print(f"File '{path}' not found. Using an empty word set.", file=sys.stderr)
+               continue
+          for word in data.decode("utf-8").splitlines():
+               masks[word] = masks.get(word, 0) | 1 << bit
+          # Remember which version of the text files the automaton was built from
+          size += stat.st_size
+          mtime = max(mtime, stat.st_mtime_ns)
+          digests.append(hashlib.sha256(data).digest())
+     source = (size, mtime, layers_digest(digests)) if digests else None
+     return DAWG.from_words((), source, masks, [name for name, path in layers], fold_aliases(masks))
+
+# Image path method
+def default_image_path(file_path):
+     """Return the compiled image path that sits next to a word list."""
+     return os.path.splitext(file_path)[0] + ".dawg"
+
+# Image freshness method
+def image_is_current(image, file_path):
+     """Return True if a compiled image was built from the current contents of the word list and its layers."""
+     layers = layer_paths(file_path)
+     if image.source is None or list(image.layers) != [name for name, path in layers]:
+          return False
+     size, mtime, digest = image.source
+     stats = [os.stat(path) for name, path in layers]
+     if sum(stat.st_size for stat in stats) != size:
+          return False
+     if max(stat.st_mtime_ns for stat in stats) == mtime:
+          return True
+     # Touched but maybe unchanged: fall back to the checksum
+     digests = []
+     for name, path in layers:
+          with open(path, "rb") as file:
+               digests.append(hashlib.sha256(file.read()).digest())
+     return layers_digest(digests) == digest
+
+# Ensure image method
+def ensure_image(file_path, image_path=None):
+     """Build the binary image for a word list if it is missing, unreadable or stale."""
+     image_path = image_path or default_image_path(file_path)
+     try:
+          if image_is_current(DAWG.open(image_path), file_path):
+               return image_path
+     except (OSError, ValueError):
+          pass  # Missing, corrupt or from another image version
+     load_filipino_word_list(file_path).save(image_path)
+     return image_path
+
+# Index path method
+def default_index_path(file_path):
+     """Return the SymSpell index path that sits next to a word list."""
+     return os.path.splitext(file_path)[0] + ".symspell"
+
+# Suggestion backend method
+def load_suggester(lexicon, backend="automaton", max_distance=2, index_path=None, prefix_length=10,
+                   frequencies_path=None):
+     """Return the suggestion backend for a lexicon.
+
+     "automaton" walks a Levenshtein automaton over the DAWG and needs no
+     precomputation. "symspell" answers from a precomputed delete index, which
+     is faster per query; with index_path the index is memory-mapped from disk
+     and only rebuilt when the word list or the settings change. If a frequency
+     table exists at frequencies_path, either backend ranks by its
+     noisy-channel score."""
+     if backend == "symspell":
+          if index_path is None:
+               suggester = SymSpellIndex.build(lexicon, max_distance, prefix_length)
+          else:
+               suggester = SymSpellIndex.load(index_path, lexicon, max_distance, prefix_length)
+     elif backend == "automaton":
+          suggester = Suggester(lexicon, max_distance=max_distance)
+     else:
+          raise ValueError(f"Unknown suggestion backend '{backend}'")
+     suggester.frequencies = load_frequencies(frequencies_path, lexicon)
+     return suggester
+
+# Loading the dictionary through its compiled image
+def load_dictionary(file_path, image_path=None):
+     """Return the lexicon for a word list, memory-mapped from its compiled image.
+
+     The image is rebuilt automatically whenever the word list changes. If it
+     cannot be written (for example a read-only directory) the word list is
+     compiled in memory instead."""
+     if not os.path.exists(file_path):
+          return load_filipino_word_list(file_path)
+     try:
+          return DAWG.open(ensure_image(file_path, image_path))
+     except (OSError, ValueError) as e:
+          print(f"[WARNING] Cannot use the compiled dictionary ({e}). Loading '{file_path}' directly.", file=sys.stderr)
+          return load_filipino_word_list(file_path)
+
+## ============================================================ ## CHECKER CLASS ## ============================================================ ##
+# Headless spell checker that does not depend on any GUI module
+class Checker:
+     # Constructor
+     def __init__(self, lexicon=None, suggest=False, max_suggestions=5, max_distance=2, cache_size=100000,
+                  morphology=True, backend="automaton", index_path=None, prefix_length=10, frequencies_path=None,
+                  personal_path=None, layers=None, ngram_path=None):
+          self.lexicon = lexicon if lexicon is not None else load_dictionary(file_path)
+          # Dictionary words that a confusable word fits better in context ("ng" for "nang") are reported too
+          self.ngram_path = ngram_path
+          self.context = load_ngram_model(ngram_path, self.lexicon)
+          self.backend = (backend, max_distance, index_path, prefix_length, frequencies_path)
+          self._suggester = None  # Created on the first suggestion request
+          self.suggest = suggest
+          self.max_suggestions = max_suggestions
+          # Words the user added or ignored are accepted on top of the dictionary layers that are enabled
+          self.layered = LayeredLexicon(self.lexicon, PersonalWordList(personal_path), layers)
+          # Inflected forms are accepted when their root is listed (see morphology.py)
+          self.analyzer = MorphologyAnalyzer(self.layered) if morphology else None
+          # Tokens repeat heavily in real text, so results are cached per word (an analyzer over an empty
+          # lexicon has len() 0, so it is tested against None rather than for truthiness)
+          validator = self.layered if self.analyzer is None else self.analyzer
+          self.cache = WordCache(validator, normalize_word, self._lookup_suggestions, maxsize=cache_size)
+
+     # Is valid method
+     def is_valid(self, word):
+          """Return True if the word, after normalization, is in the lexicon or is an inflection of a word in it."""
+          return self.cache.is_valid(word)
+
+     # Get suggestions method
+     def get_suggestions(self, word):
+          """Return up to max_suggestions ranked suggestions for the word."""
+          return self.cache.suggestions(word)
+
+     # Suggester property
+     @property
+     def suggester(self):
+          if self._suggester is None:
+               self._suggester = load_suggester(self.lexicon, *self.backend)
+          return self._suggester
+
+     # Lookup suggestions method
+     def _lookup_suggestions(self, clean_word):
+          n = self.max_suggestions
+          if self.layered.selected is None:
+               return [suggestion for suggestion, distance in self.suggester.suggest(clean_word, n=n)]
+          # The suggester covers every layer; keep the words of the enabled ones
+          found = self.suggester.suggest(clean_word, n=2 * n)
+          return [suggestion for suggestion, distance in found if suggestion in self.layered][:n]
+
+     # Set lexicon method
+     def set_lexicon(self, lexicon):
+          """Switch to a reloaded dictionary and drop every cached result."""
+          self.lexicon = lexicon
+          self._suggester = None  # A SymSpell index is tied to its word list, so it is rebuilt on demand
+          self.layered.base = lexicon
+          self.context = load_ngram_model(self.ngram_path, lexicon)  # Keyed by word IDs, so it must match
+          self.cache.invalidate()
+
+     # Set layers method
+     def set_layers(self, names=None):
+          """Accept words from these dictionary layers only (None: all of them)."""
+          self.layered.set_layers(names)
+          self.cache.invalidate()
+
+     # Add word method
+     def add_word(self, word):
+          """Accept a word from now on and record it in the personal word list."""
+          self.layered.personal.add(self.cache.normalized(word))
+          self.cache.invalidate()  # The word may also be the root of inflected forms
+
+     # Ignore word method
+     def ignore_word(self, word):
+          """Stop flagging a word and record it in the personal word list."""
+          self.layered.personal.ignore(self.cache.normalized(word))
+          self.cache.invalidate()
+
+     # Check line method
+     def check_line(self, line, line_number=1, offset=0):
+          """Yield one result per token of a single line.
+
+          line_number is 1-based and col is 0-based, matching Tk text indices;
+          offset is the character offset of the line within its source."""
+          yield from self._results(tokenize(line, line_number, offset, self.cache.normalized))
+
+     # Results method
+     def _results(self, tokens):
+          """Yield the result of every token, scored in context one sentence (or bounded piece of one) at a time if there is a model."""
+          if self.context is None:
+               for token in tokens:
+                    yield self._result(token)
+               return
+          for sentence, start, stop in sentences(tokens):
+               if profiler.enabled:
+                    started = time.perf_counter_ns()
+               replacements = self.context.check(sentence, start, stop)
+               if profiler.enabled:
+                    profiler.record("context", started)
+                    profiler.count("context errors", len(replacements))
+               for i in range(start, stop):
+                    result = self._result(sentence[i])
+                    if i in replacements and result["valid"]:
+                         result["context"] = replacements[i]
+                    yield result
+
+     # Result method
+     def _result(self, token):
+          if profiler.enabled:
+               started = time.perf_counter_ns()
+          valid = self.is_valid(token.token)
+          if profiler.enabled:
+               profiler.record("lookup", started)
+               profiler.count("words checked")
+               profiler.count("invalid", not valid)
+          result = {
+               "line": token.line,
+               "col": token.col,
+               "offset": token.start,
+               "word": token.token,
+               "valid": valid,
+          }
+          if valid and token.normalized in self.lexicon.aliases:
+               # The dictionary's own spelling when the token only matched once folded (Binan -> biñan)
+               canonical = self.layered.canonical(token.normalized)
+               if canonical is not None and canonical != token.normalized:
+                    result["canonical"] = canonical
+          if valid and len(self.layered.layers) > 1:
+               # Which word list accepted it; inflected forms are accepted through their root
+               result["layer"] = self.layered.layer(token.normalized) or "morphology"
+          if self.suggest:
+               if profiler.enabled and not valid:
+                    started = time.perf_counter_ns()
+               result["suggestions"] = [] if valid else self.get_suggestions(token.token)
+               if profiler.enabled and not valid:
+                    profiler.record("suggest", started)
+          return result
+
+     # Check lines method
+     def check_lines(self, lines, line_number=1, offset=0):
+          """Stream results for an iterable of lines (such as an open file)."""
+          for line_number, line in enumerate(lines, start=line_number):
+               yield from self.check_line(line, line_number, offset)
+               offset += len(line)
+
+     # Check stream method
+     def check_stream(self, chunks, line_number=1, offset=0):
+          """Stream results for an iterable of text chunks of any size, in constant memory.
+
+          Chunks need not end at a line or word boundary (a feed read 64 KB at
+          a time, say); words split across chunks are joined before checking."""
+          yield from self._results(tokenize_stream(chunks, line_number, offset, self.cache.normalized))
+
+     # Check text method
+     def check_text(self, text):
+          """Return the results for a whole string."""
+          return list(self.check_lines(text.splitlines(keepends=True)))
+
+## ============================================================ ## COMMAND LINE ## ============================================================ ##
+# Read chunks method
+def read_chunks(file, size=1 << 16, before_read=None):
+     """Yield a text file in chunks of at most size characters, ending early at newlines so live feeds are not held up."""
+     while True:
+          if before_read is not None:
+               before_read()
+          chunk = file.readline(size)
+          if not chunk:
+               return
+          yield chunk
+
+# Format result method
+def format_results(results, name, invalid_only=False):
+     """Render results as JSON lines tagged with their source name."""
+     lines = []
+     for result in results:
+          if invalid_only and result["valid"] and "context" not in result:
+               continue
+          result["file"] = name
+          lines.append(json.dumps(result, ensure_ascii=False))
+          lines.append("\n")
+     return "".join(lines)
+
+# Argument parser method
+def build_parser():
+     parser = argparse.ArgumentParser(description="Check Tagalog text against filipino_dict.txt without the GUI.")
+     parser.add_argument("files", nargs="*", default=["-"], help="files to check ('-' or nothing reads stdin)")
+     parser.add_argument("--dictionary", default=file_path, help="word list to check against")
+     parser.add_argument("--suggest", action="store_true", help="include suggestions for invalid words")
+     parser.add_argument("--invalid-only", action="store_true", help="only report invalid words")
+     parser.add_argument("--max-suggestions", type=int, default=5, help="suggestions per invalid word")
+     parser.add_argument("--max-distance", type=int, default=2, help="maximum edit distance for suggestions")
+     parser.add_argument("--jobs", type=int, default=1, help="worker processes; above 1 shards the files across a process pool")
+     parser.add_argument("--image", help="compiled dictionary image (default: next to the dictionary, rebuilt when it changes)")
+     parser.add_argument("--cache-size", type=int, default=100000, help="words kept in the result cache")
+     parser.add_argument("--stats", action="store_true", help="print cache hit/miss/eviction counters to stderr (single process only)")
+     parser.add_argument("--profile", action="store_true", help="print per-stage latency percentiles and counters to stderr (single process only)")
+     parser.add_argument("--backend", choices=("automaton", "symspell"), default="automaton",
+                         help="suggestion backend; symspell precomputes a delete index next to the dictionary")
+     parser.add_argument("--prefix-length", type=int, default=10,
+                         help="characters of each word indexed by the symspell backend (shorter: smaller index, slower queries)")
+     parser.add_argument("--frequencies", help="frequency table for ranking suggestions (default: next to the dictionary, if built)")
+     parser.add_argument("--personal", help="personal word list log (default: next to the dictionary, if present)")
+     parser.add_argument("--no-morphology", action="store_true", help="only accept words listed in the dictionary")
+     parser.add_argument("--layers", help="comma-separated dictionary layers to accept (default: every word list found, "
+                                          "e.g. tagalog,english,domain)")
+     parser.add_argument("--context", action="store_true",
+                         help="also report dictionary words that a confusable word fits better (needs a model built with ngram.py)")
+     parser.add_argument("--ngram", help="n-gram model for --context (default: next to the dictionary)")
+     parser.add_argument("--shard-size", type=int, default=4 << 20, help="bytes of input per parallel work item")
+     return parser
+
+# Main method
+def main(argv=None):
+     parser = build_parser()
+     args = parser.parse_args(argv)
+     if args.jobs > 1 and (args.profile or args.stats):
+          # Every worker process has its own profiler and cache, which the parent never sees
+          parser.error("--profile and --stats need --jobs 1")
+     out = sys.stdout
+     layers = args.layers.split(",") if args.layers else None
+     ngram_path = (args.ngram or default_model_path(args.dictionary)) if args.context else None
+     if ngram_path and not os.path.exists(ngram_path):
+          print(f"[WARNING] No n-gram model at '{ngram_path}'; build one with ngram.py. Checking without context.", file=sys.stderr)
+
+     # Parallel mode: every worker maps the same read-only dictionary image
+     if args.jobs > 1:
+          if "-" in args.files:
+               print("[ERROR] Parallel mode needs file arguments, not stdin.", file=sys.stderr)
+               return 1
+          from parallel import check_files
+          image_path = ensure_image(args.dictionary, args.image)
+          index_path = default_index_path(args.dictionary)
+          frequencies_path = args.frequencies or default_table_path(args.dictionary)
+          if args.suggest and args.backend == "symspell":
+               # Build the index once here so the workers only have to map it
+               load_suggester(DAWG.open(image_path), args.backend, args.max_distance, index_path, args.prefix_length)
+          try:
+               for chunk in check_files(args.files, image_path, args.jobs, args.shard_size, suggest=args.suggest,
+                                        max_suggestions=args.max_suggestions, max_distance=args.max_distance,
+                                        cache_size=args.cache_size, invalid_only=args.invalid_only,
+                                        morphology=not args.no_morphology, backend=args.backend,
+                                        index_path=index_path, prefix_length=args.prefix_length,
+                                        frequencies_path=frequencies_path,
+                                        personal_path=args.personal or default_personal_path(args.dictionary),
+                                        layers=layers, ngram_path=ngram_path):
+                    out.write(chunk)
+          except OSError as e:
+               print(f"[ERROR] {e}", file=sys.stderr)
+               return 1
+          return 0
+
+     profiler.enable(args.profile)
+     checker = Checker(load_dictionary(args.dictionary, args.image), suggest=args.suggest,
+                       max_suggestions=args.max_suggestions, max_distance=args.max_distance,
+                       cache_size=args.cache_size, morphology=not args.no_morphology, backend=args.backend,
+                       index_path=default_index_path(args.dictionary), prefix_length=args.prefix_length,
+                       frequencies_path=args.frequencies or default_table_path(args.dictionary),
+                       personal_path=args.personal or default_personal_path(args.dictionary), layers=layers,
+                       ngram_path=ngram_path)
+     for name in args.files:
+          if name == "-":
+               source = sys.stdin
+          else:
+               try:
+                    source = open(name, "r", encoding="utf-8")
+               except OSError as e:
+                    print(f"[ERROR] Cannot open '{name}': {e}", file=sys.stderr)
+                    return 1
+          with source:
+               # Stream the input so a feed without line breaks, or one that never ends, runs in constant
+               # memory; results are flushed before every read so they appear as soon as a word is complete
+               for result in checker.check_stream(read_chunks(source, before_read=out.flush)):
+                    out.write(format_results((result,), name, args.invalid_only))
+     if args.stats:
+          print(json.dumps({"cache": checker.cache.stats()}), file=sys.stderr)
+     if args.profile:
+          profiler.dump(sys.stderr.write)
+     return 0
+
+## ============================================================ ## RUN THE CHECKER ## ============================================================ ##
+if __name__ == "__main__":
+     sys.exit(main())
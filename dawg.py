@@ -0,0 +1,393 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Array module for the compact transition table
+from array import array
+
+# Struct module for the on-disk image
+import struct
+
+# Shared memory-mapped image format
+from image import map_image, write_image
+
+# On-disk image layout. The labels come first so that a memory-mapped image can
+# be searched with mmap.find() at the same edge offsets as the in-memory bytes:
+#   [labels][padding][first][targets][counts][final][masks][alphabet (UTF-8)][layer names (UTF-8)][aliases (UTF-8)][trailer]
+# The trailer ends with the version and magic (see image.py) so any version can be identified.
+IMAGE_MAGIC = b"FSMDAWG\0"
+IMAGE_VERSION = 5
+IMAGE_TRAILER = struct.Struct("<IIIIIIQQ32sI8s")  # nodes, edges, words, alphabet bytes, layer name bytes, alias bytes, source size, source mtime, source SHA-256, version, magic
+
+## ============================================================ ## BUILD NODE CLASS ## ============================================================ ##
+# Temporary trie node used only while the automaton is being built
+class _BuildNode:
+     __slots__ = ("final", "edges", "id")
+
+     # Constructor
+     def __init__(self):
+          self.final = 0  # Layer mask of the word ending here (0: no word ends here)
+          self.edges = {}
+          self.id = None
+
+     # Register key method
+     def key(self):
+          """Return the signature shared by all equivalent nodes."""
+          return (self.final, tuple((char, child.id) for char, child in sorted(self.edges.items())))
+
+## ============================================================ ## DAWG CLASS ## ============================================================ ##
+# Minimal deterministic acyclic word graph (minimized DFA) over a word list
+#
+# The automaton is stored as flat arrays so that the whole lexicon costs a few
+# bytes per edge instead of one Python str object per word:
+#   first[n] .. first[n + 1]  -> slice of edges leaving node n (sorted by label)
+#   labels[e]                 -> one byte, the alphabet code of edge e
+#   targets[e]                -> node reached by edge e
+#   final[n]                  -> 1 if a word ends at node n
+#   counts[n]                 -> number of words accepted from node n
+#   masks[n]                  -> bit i set if the word ending at node n is in layer i
+# Node 0 is the start state. The counts make the automaton a minimal perfect
+# hash: every word has an ID, its rank in sorted order (see word_id/word_at).
+#
+# Several word lists (layers) can share one automaton: minimization only keeps
+# two nodes apart when the layers of the words ending there differ, so words
+# and suffixes common to several lists are stored once, and a single walk tells
+# which layers list a word (see mask).
+#
+# Aliases map a lookup key to the word it stands for, for words whose folded
+# form (see tokenizer.normalize_word) differs from their spelling: "binan" for
+# "biñan", "ako'y" for "ako’y". A lookup that falls off the graph tries the
+# alias table, so membership, masks and IDs answer for the folded key while
+# iteration, IDs and word_at keep the canonical spelling.
+class DAWG:
+     # Constructor
+     def __init__(self, alphabet, first, labels, targets, final, counts, word_count, source=None,
+                  masks=None, layers=(), aliases=None):
+          self.alphabet = alphabet
+          self.aliases = aliases or {}  # Folded key -> canonical word, for keys that are not words themselves
+          self.source = source  # (size, mtime_ns, sha256) of the word list this was built from
+          self.layers = tuple(layers)  # Name of every layer, by bit
+          self._codes = {char: bytes((code,)) for code, char in enumerate(alphabet)}
+          self._first = first
+          self._labels = labels
+          self._targets = targets
+          self._final = final
+          self._counts = counts
+          self._masks = masks if masks is not None else final  # A single list is layer 0 throughout
+          self._word_count = word_count
+
+     # Build method
+     @classmethod
+     def from_words(cls, words, source=None, masks=None, layers=(), aliases=None):
+          """Compile an iterable of words into a minimal DAWG.
+
+          masks optionally maps every word to the bitmask of the layers that
+          list it (bit i for layers[i]); words is then ignored. aliases maps
+          extra lookup keys to words of the list."""
+          words = sorted(masks) if masks is not None else sorted(set(words))
+          alphabet = "".join(sorted(set("".join(words))))
+          if len(alphabet) > 256:
+               raise ValueError("DAWG alphabet is limited to 256 distinct characters")
+
+          # Incremental construction from sorted input (Daciuk et al.)
+          root = _BuildNode()
+          register = {}
+          unchecked = []  # (parent, char, child) along the last inserted word
+          previous = ""
+
+          def minimize(down_to):
+               # Replace or register every unchecked node below the common prefix
+               while len(unchecked) > down_to:
+                    parent, char, child = unchecked.pop()
+                    key = child.key()
+                    if key in register:
+                         parent.edges[char] = register[key]
+                    else:
+                         child.id = len(register) + 1
+                         register[key] = child
+
+          for word in words:
+               # Length of the prefix shared with the previous word
+               common = 0
+               for a, b in zip(word, previous):
+                    if a != b:
+                         break
+                    common += 1
+               minimize(common)
+
+               node = unchecked[-1][2] if unchecked else root
+               for char in word[common:]:
+                    child = _BuildNode()
+                    node.edges[char] = child
+                    unchecked.append((node, char, child))
+                    node = child
+               node.final = masks[word] if masks is not None else 1
+               previous = word
+          minimize(0)
+
+          return cls._freeze(root, alphabet, len(words), source, layers, aliases)
+
+     # Freeze method
+     @classmethod
+     def _freeze(cls, root, alphabet, word_count, source, layers=(), aliases=None):
+          """Number the nodes breadth-first and lay the edges out in flat arrays."""
+          codes = {char: code for code, char in enumerate(alphabet)}
+          order = [root]
+          numbers = {id(root): 0}
+          first = array("I")
+          labels = bytearray()
+          targets = array("I")
+          final = bytearray()
+          masks = bytearray()
+
+          index = 0
+          while index < len(order):
+               node = order[index]
+               index += 1
+               first.append(len(targets))
+               final.append(1 if node.final else 0)
+               masks.append(node.final)
+               for char in sorted(node.edges, key=codes.__getitem__):
+                    child = node.edges[char]
+                    if id(child) not in numbers:
+                         numbers[id(child)] = len(order)
+                         order.append(child)
+                    labels.append(codes[char])
+                    targets.append(numbers[id(child)])
+          first.append(len(targets))
+
+          # Words below every node, children before parents
+          counts = array("I", bytes(4 * len(final)))
+          done = bytearray(len(final))
+          stack = [0]
+          while stack:
+               node = stack[-1]
+               if done[node]:
+                    stack.pop()
+                    continue
+               children = targets[first[node]:first[node + 1]]
+               pending = [child for child in children if not done[child]]
+               if pending:
+                    stack.extend(pending)
+                    continue
+               counts[node] = final[node] + sum(counts[child] for child in children)
+               done[node] = 1
+               stack.pop()
+
+          return cls(alphabet, first, bytes(labels), targets, final, counts, word_count, source,
+                     masks if masks != final else None, layers, aliases)
+
+     # Walk method
+     def walk(self, text, node=0):
+          """Follow text from node and return the node reached, or -1 if the walk falls off the graph."""
+          codes = self._codes
+          first = self._first
+          labels = self._labels
+          targets = self._targets
+          for char in text:
+               code = codes.get(char)
+               if code is None:
+                    return -1
+               edge = labels.find(code, first[node], first[node + 1])
+               if edge < 0:
+                    return -1
+               node = targets[edge]
+          return node
+
+     # Membership method
+     def __contains__(self, word):
+          node = self.walk(word)
+          return node >= 0 and self._final[node] == 1 or word in self.aliases
+
+     # Mask method
+     def mask(self, word):
+          """Return the layer bitmask of word (0 if no layer lists it)."""
+          node = self.walk(word)
+          if node >= 0 and self._final[node]:
+               return self._masks[node]
+          alias = self.aliases.get(word)
+          return self.mask(alias) if alias is not None else 0
+
+     # Canonical method
+     def canonical(self, word):
+          """Return the listed spelling of word or of the word it is an alias of, or None."""
+          node = self.walk(word)
+          if node >= 0 and self._final[node]:
+               return word
+          return self.aliases.get(word)
+
+     # Length method
+     def __len__(self):
+          return self._word_count
+
+     # Iteration method
+     def __iter__(self):
+          """Yield every word in sorted order."""
+          alphabet = self.alphabet
+          stack = [(0, "")]
+          while stack:
+               node, prefix = stack.pop()
+               if self._final[node]:
+                    yield prefix
+               # Push in reverse so the smallest label is visited first
+               for edge in range(self._first[node + 1] - 1, self._first[node] - 1, -1):
+                    stack.append((self._targets[edge], prefix + alphabet[self._labels[edge]]))
+
+     # Word ID method
+     def word_id(self, word):
+          """Return the rank of word (or of the word it is an alias of) in sorted order, or -1 if it is not in the lexicon."""
+          rank = self._rank(word)
+          if rank < 0 and word in self.aliases:
+               return self._rank(self.aliases[word])
+          return rank
+
+     # Rank method
+     def _rank(self, word):
+          codes = self._codes
+          first = self._first
+          labels = self._labels
+          targets = self._targets
+          counts = self._counts
+          final = self._final
+          node = 0
+          rank = 0
+          for char in word:
+               code = codes.get(char)
+               if code is None:
+                    return -1
+               edge = labels.find(code, first[node], first[node + 1])
+               if edge < 0:
+                    return -1
+               # Skip the word ending here and every word under a smaller label
+               rank += final[node]
+               for skipped in range(first[node], edge):
+                    rank += counts[targets[skipped]]
+               node = targets[edge]
+          return rank if final[node] else -1
+
+     # Word at method
+     def word_at(self, word_id):
+          """Return the word with the given ID (the inverse of word_id)."""
+          if not 0 <= word_id < self._word_count:
+               raise IndexError(f"word ID {word_id} out of range")
+          alphabet = self.alphabet
+          first = self._first
+          labels = self._labels
+          targets = self._targets
+          counts = self._counts
+          chars = []
+          node = 0
+          while True:
+               if self._final[node]:
+                    if word_id == 0:
+                         return "".join(chars)
+                    word_id -= 1
+               for edge in range(first[node], first[node + 1]):
+                    count = counts[targets[edge]]
+                    if word_id < count:
+                         chars.append(alphabet[labels[edge]])
+                         node = targets[edge]
+                         break
+                    word_id -= count
+
+     # Is final method
+     def is_final(self, node):
+          return self._final[node] == 1
+
+     # Edges method
+     def edges(self, node):
+          """Yield (char, child) for every edge leaving node."""
+          alphabet = self.alphabet
+          labels = self._labels
+          targets = self._targets
+          for edge in range(self._first[node], self._first[node + 1]):
+               yield alphabet[labels[edge]], targets[edge]
+
+     # Ranked edges method
+     def ranked_edges(self, node, rank):
+          """Yield (char, child, child rank) for every edge leaving node.
+
+          rank is the ID of the first word at or below node; the child rank is
+          the ID of the first word below the child, so a search that carries it
+          along knows the ID of every word it reaches without a second walk."""
+          alphabet = self.alphabet
+          labels = self._labels
+          targets = self._targets
+          counts = self._counts
+          rank += self._final[node]
+          for edge in range(self._first[node], self._first[node + 1]):
+               child = targets[edge]
+               yield alphabet[labels[edge]], child, rank
+               rank += counts[child]
+
+     # Node count property
+     @property
+     def node_count(self):
+          return len(self._final)
+
+     # Edge count property
+     @property
+     def edge_count(self):
+          return len(self._targets)
+
+     # Memory usage method
+     def nbytes(self):
+          """Approximate size of the transition table in bytes."""
+          return (len(self._first) * self._first.itemsize + self.edge_count
+                  + len(self._targets) * self._targets.itemsize
+                  + len(self._counts) * self._counts.itemsize + len(self._final)
+                  + (len(self._masks) if self._masks is not self._final else 0))
+
+     # Save method
+     def save(self, path):
+          """Write the automaton to a binary image that open() can memory-map."""
+          edge_count = self.edge_count
+          alphabet = self.alphabet.encode("utf-8")
+          layers = "\n".join(self.layers).encode("utf-8")
+          aliases = "\0".join(f"{key}\0{word}" for key, word in sorted(self.aliases.items())).encode("utf-8")
+          source_size, source_mtime, source_digest = self.source or (0, 0, b"")
+          write_image(path, (bytes(self._labels[:edge_count]),
+                             b"\0" * (-edge_count % 4),  # Align the integer arrays
+                             array("I", self._first).tobytes(),
+                             array("I", self._targets).tobytes(),
+                             array("I", self._counts).tobytes(),
+                             bytes(self._final),
+                             bytes(self._masks),
+                             alphabet,
+                             layers,
+                             aliases),
+                      IMAGE_TRAILER.pack(self.node_count, edge_count, self._word_count, len(alphabet), len(layers),
+                                         len(aliases), source_size, source_mtime, source_digest,
+                                         IMAGE_VERSION, IMAGE_MAGIC))
+
+     # Open method
+     @classmethod
+     def open(cls, path):
+          """Memory-map a binary image written by save().
+
+          The image is mapped read-only, so every process that opens the same
+          file shares one copy of the transition table through the page cache."""
+          image, fields = map_image(path, IMAGE_MAGIC, IMAGE_VERSION, IMAGE_TRAILER, "DAWG image")
+          (node_count, edge_count, word_count, alphabet_size, layers_size, aliases_size,
+           source_size, source_mtime, source_digest, version, magic) = fields
+
+          view = memoryview(image)
+          offset = edge_count + (-edge_count % 4)
+          first = view[offset:offset + (node_count + 1) * 4].cast("I")
+          offset += (node_count + 1) * 4
+          targets = view[offset:offset + edge_count * 4].cast("I")
+          offset += edge_count * 4
+          counts = view[offset:offset + node_count * 4].cast("I")
+          offset += node_count * 4
+          final = view[offset:offset + node_count]
+          offset += node_count
+          masks = view[offset:offset + node_count]
+          offset += node_count
+          alphabet = bytes(view[offset:offset + alphabet_size]).decode("utf-8")
+          offset += alphabet_size
+          layers = bytes(view[offset:offset + layers_size]).decode("utf-8")
+          offset += layers_size
+          aliases = bytes(view[offset:offset + aliases_size]).decode("utf-8").split("\0") if aliases_size else []
+
+          # The labels are searched directly in the map (they start at offset 0)
+          source = (source_size, source_mtime, source_digest) if source_digest.strip(b"\0") else None
+          return cls(alphabet, first, image, targets, final, counts, word_count, source,
+                     masks if masks != final else None, layers.split("\n") if layers else (),
+                     dict(zip(aliases[::2], aliases[1::2])))
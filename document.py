@@ -0,0 +1,105 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Array and search modules for the token store
+from array import array
+from bisect import bisect_right
+import sys
+
+# Incremental re-checking (line diff)
+from incremental import changed_lines
+
+# Shared by every line without words; lines are replaced, never changed in place
+EMPTY = array("i")
+
+## ============================================================ ## DOCUMENT STATE CLASS ## ============================================================ ##
+# The words of the checked document, stored as integer IDs
+#
+# Every line keeps one flat array of (word ID, column, length) triples, so a
+# token costs 12 bytes instead of a string and a tuple. Columns are relative to
+# the line, which makes inserting or deleting lines a splice of the line list:
+# nothing after the edit is renumbered, and applying a region touches only the
+# lines it covers.
+#
+# Word IDs are the lexicon's perfect-hash IDs (0 and up). Words the lexicon
+# does not list get negative IDs from an intern table, so a misspelling that
+# repeats through the document is stored once.
+class DocumentState:
+     # Constructor
+     def __init__(self, lexicon):
+          self.reset(lexicon)
+
+     # Reset method
+     def reset(self, lexicon=None):
+          """Forget the document (and switch to another lexicon, whose IDs differ)."""
+          if lexicon is not None:
+               self.lexicon = lexicon
+          self.ids = {}  # Normalized word -> ID, for every distinct word seen
+          self.oov = []  # Word of every negative ID: oov[-1 - word_id]
+          self.lines = [""]  # Text the tokens belong to (the list shared with the tracker, not a copy)
+          self.tokens = [EMPTY]  # (word ID, column, length) triples of every line
+          self.token_count = 0
+
+     # Word ID method
+     def word_id(self, word):
+          """Return the ID of a normalized word, interning it if the lexicon does not list it."""
+          word_id = self.ids.get(word)
+          if word_id is None:
+               word_id = self.lexicon.word_id(word)
+               if word_id < 0:
+                    self.oov.append(word)
+                    word_id = -len(self.oov)
+               self.ids[word] = word_id
+          return word_id
+
+     # Word method
+     def word(self, word_id):
+          """Return the normalized word with this ID."""
+          return self.oov[-1 - word_id] if word_id < 0 else self.lexicon.word_at(word_id)
+
+     # Apply method
+     def apply(self, region):
+          """Record the words of a checked DirtyRegion (or of one part of it)."""
+          # A new text: splice the edited lines out, leaving them empty until their part arrives
+          if region.lines is not self.lines:
+               first, old_end, new_end = changed_lines(self.lines, region.lines)
+               self._splice(first, old_end, [EMPTY] * (new_end - first))
+               self.lines = region.lines
+
+          first = region.first_line - 1
+          lines = [[] for _ in range(first, region.last_line)]
+          for token in region.words:
+               lines[token.line - 1 - first] += (self.word_id(token.normalized), token.col, len(token.token))
+          self._splice(first, region.last_line, [array("i", line) if line else EMPTY for line in lines])
+
+     # Splice method
+     def _splice(self, first, old_end, tokens):
+          removed = sum(len(line) for line in self.tokens[first:old_end])
+          self.tokens[first:old_end] = tokens
+          self.token_count += (sum(len(line) for line in tokens) - removed) // 3
+
+     # Token at method
+     def token_at(self, line, col):
+          """Return (start column, end column, word ID) of the word at a 1-based line and column, or None."""
+          if not 0 < line <= len(self.tokens):
+               return None
+          triples = self.tokens[line - 1]
+          i = bisect_right(triples[1::3], col) - 1
+          if i < 0:
+               return None
+          word_id, start, length = triples[3 * i:3 * i + 3]
+          return (start, start + length, word_id) if col < start + length else None
+
+     # Text method
+     def text(self, line, start, end):
+          """Return the characters of a token as they appear in the document."""
+          return self.lines[line - 1][start:end]
+
+     # Length method
+     def __len__(self):
+          return self.token_count
+
+     # Memory usage method
+     def nbytes(self):
+          """Approximate bytes used by the token store (the intern table's words included)."""
+          arrays = sum(sys.getsizeof(line) for line in self.tokens if line is not EMPTY)
+          interned = sys.getsizeof(self.ids) + sum(sys.getsizeof(word) for word in self.ids)
+          return sys.getsizeof(self.tokens) + arrays + interned
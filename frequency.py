@@ -0,0 +1,120 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Command-line module
+import argparse
+import sys
+
+# Array and math modules for the frequency table
+from array import array
+import math
+
+# Modules for the on-disk table
+import os
+import struct
+
+# Shared memory-mapped image format
+from image import check_lexicon, corpus_lines, lexicon_digest, load_optional, map_image, write_image
+
+# Shared tokenizer and cleaning rule
+from tokenizer import TOKEN_PATTERN, normalize_word
+
+# On-disk table layout: [counts (uint32 per word ID)][trailer]
+# The trailer ends with the version and magic, like every image (see image.py).
+TABLE_MAGIC = b"FSMFREQ\0"
+TABLE_VERSION = 1
+TABLE_TRAILER = struct.Struct("<IQ32sI8s")  # lexicon words, total count, lexicon SHA-256, version, magic
+
+# Table path method
+def default_table_path(file_path):
+     """Return the frequency table path that sits next to a word list."""
+     return os.path.splitext(file_path)[0] + ".freq"
+
+## ============================================================ ## FREQUENCY TABLE CLASS ## ============================================================ ##
+# Unigram counts keyed by the lexicon's word IDs, used for noisy-channel ranking
+#
+# A candidate c for a typed word w is scored by
+#   log P(c) + distance(w, c) * log(error_rate)
+# where P(c) is the add-one smoothed corpus frequency of c and error_rate is
+# the probability of one typing error. A common word one edit away therefore
+# beats a rare one at the same distance, while an extra edit costs as much as
+# being about 1 / error_rate times rarer.
+class FrequencyTable:
+     # Constructor
+     def __init__(self, lexicon, counts, total, error_rate=0.01):
+          self.lexicon = lexicon
+          self.counts = counts
+          self.total = total
+          self.error_rate = error_rate
+          self._log_error = math.log(error_rate)
+          self._log_total = math.log(total + len(counts))
+
+     # Build method
+     @classmethod
+     def build(cls, lexicon, lines, error_rate=0.01):
+          """Count every word of lines that is in the lexicon."""
+          counts = array("I", bytes(4 * len(lexicon)))
+          total = 0
+          for line in lines:
+               for match in TOKEN_PATTERN.finditer(line):
+                    word_id = lexicon.word_id(normalize_word(match.group()))
+                    if word_id >= 0:
+                         counts[word_id] += 1
+                         total += 1
+          return cls(lexicon, counts, total, error_rate)
+
+     # Count method
+     def count(self, word):
+          word_id = self.lexicon.word_id(word)
+          return self.counts[word_id] if word_id >= 0 else 0
+
+     # Score method
+     def score(self, word_id, distance):
+          """Log-probability of the word with this ID given that it was typed with distance errors."""
+          return math.log(self.counts[word_id] + 1) - self._log_total + distance * self._log_error
+
+     # Save method
+     def save(self, path):
+          write_image(path, (array("I", self.counts).tobytes(),),
+                      TABLE_TRAILER.pack(len(self.counts), self.total, lexicon_digest(self.lexicon), TABLE_VERSION, TABLE_MAGIC))
+
+     # Open method
+     @classmethod
+     def open(cls, path, lexicon, error_rate=0.01):
+          """Memory-map a table written by save() for the same lexicon."""
+          image, (word_count, total, digest, version, magic) = \
+               map_image(path, TABLE_MAGIC, TABLE_VERSION, TABLE_TRAILER, "frequency table")
+          # Counts are keyed by word ID, so they only fit the word list they were built for
+          check_lexicon(path, lexicon, word_count, digest, "frequency.py")
+          counts = memoryview(image)[:word_count * 4].cast("I")
+          return cls(lexicon, counts, total, error_rate)
+
+# Load frequencies method
+def load_frequencies(path, lexicon, error_rate=0.01):
+     """Return the frequency table at path, or None if there is none or it does not fit the lexicon."""
+     return load_optional(path, "frequency table", FrequencyTable.open, lexicon, error_rate)
+
+## ============================================================ ## COMMAND LINE ## ============================================================ ##
+# Main method
+def main(argv=None):
+     from checker import file_path, load_dictionary
+
+     parser = argparse.ArgumentParser(description="Build the unigram frequency table used to rank suggestions.")
+     parser.add_argument("corpus", nargs="+", help="UTF-8 text files to count words in")
+     parser.add_argument("--dictionary", default=file_path, help="word list the table is keyed by")
+     parser.add_argument("--output", help="table path (default: next to the dictionary)")
+     args = parser.parse_args(argv)
+
+     lexicon = load_dictionary(args.dictionary)
+     try:
+          table = FrequencyTable.build(lexicon, corpus_lines(args.corpus))
+     except OSError as e:
+          print(f"[ERROR] {e}", file=sys.stderr)
+          return 1
+     output = args.output or default_table_path(args.dictionary)
+     table.save(output)
+     known = sum(1 for count in table.counts if count)
+     print(f"[STATUS]: Counted {table.total} tokens ({known} distinct dictionary words) into '{output}'.")
+     return 0
+
+## ============================================================ ## BUILD THE TABLE ## ============================================================ ##
+if __name__ == "__main__":
+     sys.exit(main())
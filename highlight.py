@@ -0,0 +1,98 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Shared tokenizer
+from tokenizer import tokenize
+
+# Incremental re-checking (line diff)
+from incremental import changed_lines
+
+# Tag ranges method
+def tag_ranges(text_widget, action, tag, ranges):
+     """Add or remove tag over every (start, end) Tk index pair in one Tcl command."""
+     if not ranges:
+          return
+     # CTkTextbox wraps a tk.Text; its tag_add/tag_remove only take one range
+     text = getattr(text_widget, "_textbox", text_widget)
+     indices = [index for pair in ranges for index in pair]
+     text.tk.call(text._w, "tag", action, tag, *indices)
+
+## ============================================================ ## HIGHLIGHT LAYER CLASS ## ============================================================ ##
+# Keeps the invalid-word tag of a text widget in step with the checked regions
+#
+# The layer remembers the text it last highlighted and the invalid (start, end)
+# columns on every line. Applying a region costs at most three Tcl commands
+# however many words it holds:
+#   - edited lines are cleared in one tag remove (Tk may have stretched the old
+#     tag over typed characters, so their old ranges cannot be trusted),
+#   - unchanged lines that were re-checked (after a dictionary change) only
+#     lose the ranges that became valid, in one batched tag remove,
+#   - every new invalid range is added in one batched tag add.
+# Highlights that did not change are never touched. The tag style is
+# configured once, when the layer is created.
+class HighlightLayer:
+     # Constructor
+     def __init__(self, text_widget, tag="invalid", **style):
+          self.text_widget = text_widget
+          self.tag = tag
+          self.lines = [""]  # Text of every line as last highlighted
+          self.ranges = [()]  # Invalid (start, end) columns on every line
+          self.text_widget.tag_config(tag, **(style or {"foreground": "red"}))
+
+     # Reset method
+     def reset(self):
+          """Remove every highlight (after the widget text was replaced wholesale)."""
+          self.text_widget.tag_remove(self.tag, "1.0", "end")
+          self.lines = [""]
+          self.ranges = [()]
+
+     # Apply method
+     def apply(self, region, flags):
+          """Highlight the invalid words of a checked DirtyRegion (flags[i] is True if word i is valid)."""
+          new_lines = region.lines
+          if new_lines is self.lines:
+               # Another part of the same region: its edited lines were already cleared, only its own lines change
+               first = old_end = new_end = 0
+          else:
+               first, old_end, new_end = changed_lines(self.lines, new_lines)
+
+          # Invalid columns per checked line (0-based line numbers)
+          wanted = {line: [] for line in range(region.first_line - 1, region.last_line)}
+          for token, valid in zip(region.words, flags):
+               if not valid:
+                    wanted[token.line - 1].append((token.col, token.col + len(token.token)))
+
+          remove = []
+          add = []
+
+          # Edited lines: clear them whole and add everything that is invalid now
+          edited = [tuple(wanted.get(line, ())) for line in range(first, new_end)]
+          if new_end > first:
+               remove.append((f"{first + 1}.0", f"{new_end}.end"))
+          for line, ranges in enumerate(edited, first):
+               add.extend((f"{line + 1}.{start}", f"{line + 1}.{end}") for start, end in ranges)
+          self.ranges[first:old_end] = edited
+          self.lines = new_lines
+
+          # Re-checked lines whose text did not change: touch only the ranges that differ
+          for line, ranges in wanted.items():
+               if first <= line < new_end:
+                    continue
+               old = self.ranges[line]
+               if old == tuple(ranges):
+                    continue
+               old_set, new_set = set(old), set(ranges)
+               remove.extend((f"{line + 1}.{start}", f"{line + 1}.{end}") for start, end in old_set - new_set)
+               add.extend((f"{line + 1}.{start}", f"{line + 1}.{end}") for start, end in new_set - old_set)
+               self.ranges[line] = tuple(ranges)
+
+          tag_ranges(self.text_widget, "remove", self.tag, remove)
+          tag_ranges(self.text_widget, "add", self.tag, add)
+
+     # Count method
+     def count(self):
+          """Return the number of highlighted words."""
+          return sum(len(ranges) for ranges in self.ranges)
+
+# Word ranges method
+def word_ranges(content, word):
+     """Return the (start, end) Tk index pairs of every whole-token occurrence of word in content."""
+     return [(token.start_index, token.end_index) for token in tokenize(content) if token.token == word]
@@ -0,0 +1,80 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Modules for the on-disk images
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+# Every image ends with its version and magic, so any version of any image can be identified:
+#   [arrays and text sections][trailer ending in (version, magic)]
+IMAGE_HEADER = struct.Struct("<I8s")  # version, magic (the last 12 bytes of the file)
+
+## ============================================================ ## IMAGE FILES ## ============================================================ ##
+# Write image method
+def write_image(path, sections, trailer):
+     """Write the sections (bytes-like) and the packed trailer to path.
+
+     The file is written under a temporary name and renamed over path, so
+     readers never see a half-written image. The name is unique to this
+     writer, so two threads or processes rebuilding the same image never
+     write into one file; the last rename wins with a complete image."""
+     folder, name = os.path.split(path)
+     descriptor, temp_path = tempfile.mkstemp(prefix=f"{name}.", suffix=".tmp", dir=folder or ".")
+     try:
+          with os.fdopen(descriptor, "wb") as file:
+               for section in sections:
+                    file.write(section)
+               file.write(trailer)
+          os.chmod(temp_path, 0o644)  # mkstemp creates the file private; images are shared like the word list
+          os.replace(temp_path, path)
+     except BaseException:
+          os.remove(temp_path)
+          raise
+
+# Map image method
+def map_image(path, magic, version, trailer, kind):
+     """Memory-map an image read-only and return (mmap, trailer fields) once its magic and version check out.
+
+     kind names the image in errors ("DAWG image", "SymSpell index", ...)."""
+     with open(path, "rb") as file:
+          image = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+     if len(image) < IMAGE_HEADER.size:
+          raise ValueError(f"'{path}' is not a {kind}")
+     found_version, found_magic = IMAGE_HEADER.unpack_from(image, len(image) - IMAGE_HEADER.size)
+     if found_magic != magic:
+          raise ValueError(f"'{path}' is not a {kind}")
+     if found_version != version or len(image) < trailer.size:
+          raise ValueError(f"'{path}' has {kind} version {found_version}, expected {version}")
+     return image, trailer.unpack_from(image, len(image) - trailer.size)
+
+## ============================================================ ## LEXICON-KEYED IMAGES ## ============================================================ ##
+# Lexicon digest method
+def lexicon_digest(lexicon):
+     """Return the SHA-256 of the word list a lexicon was compiled from (empty if unknown)."""
+     return lexicon.source[2] if lexicon.source else b""
+
+# Check lexicon method
+def check_lexicon(path, lexicon, word_count, digest, tool=None):
+     """Raise ValueError unless an image keyed by word IDs was built for this lexicon (IDs mean nothing for another)."""
+     if word_count != len(lexicon) or digest.rstrip(b"\0") != lexicon_digest(lexicon):
+          hint = f"; rebuild it with {tool}" if tool else ""
+          raise ValueError(f"'{path}' was built from a different word list{hint}")
+
+# Load optional image method
+def load_optional(path, kind, open_image, *args):
+     """Return open_image(path, *args), or None if there is no file at path or it does not fit (with a warning)."""
+     if not path or not os.path.exists(path):
+          return None
+     try:
+          return open_image(path, *args)
+     except (OSError, ValueError) as e:
+          print(f"[WARNING] Ignoring {kind} ({e}).", file=sys.stderr)
+          return None
+
+# Corpus lines method
+def corpus_lines(names):
+     """Yield the lines of UTF-8 text files one by one, so a corpus never has to fit in memory."""
+     for name in names:
+          with open(name, "r", encoding="utf-8") as file:
+               yield from file
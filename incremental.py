@@ -0,0 +1,95 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Shared tokenizer
+from tokenizer import normalize_word, tokenize
+
+# Changed lines method
+def changed_lines(old_lines, new_lines):
+     """Return (first, old_end, new_end): lines first..old_end of old_lines became first..new_end of new_lines."""
+     # Skip the unchanged lines at the top and bottom of the text
+     first = 0
+     limit = min(len(old_lines), len(new_lines))
+     while first < limit and old_lines[first] == new_lines[first]:
+          first += 1
+     old_end, new_end = len(old_lines), len(new_lines)
+     while old_end > first and new_end > first and old_lines[old_end - 1] == new_lines[new_end - 1]:
+          old_end -= 1
+          new_end -= 1
+     return first, old_end, new_end
+
+## ============================================================ ## DIRTY REGION CLASS ## ============================================================ ##
+# Lines that changed between two passes, with the words found in them
+#
+# Words are tokenized on first use, so a region spanning a whole book costs
+# nothing until it is read; parts() cuts it into blocks of lines that can be
+# checked and highlighted one at a time (the visible ones first). Every part
+# commits as the whole region. Words are placed by line and column, which is
+# all Tk indices need, so no character offsets are kept.
+class DirtyRegion:
+     # Constructor
+     def __init__(self, first, new_end, lines, normalize=normalize_word):
+          self.first_line = first + 1  # 1-based, inclusive range of changed lines in the new text
+          self.last_line = new_end
+          self.normalize = normalize
+          self._words = None
+          self._lines = lines
+
+     # Words property
+     @property
+     def words(self):
+          """Token for every word in the range."""
+          if self._words is None:
+               text = "\n".join(self._lines[self.first_line - 1:self.last_line])
+               self._words = list(tokenize(text, self.first_line, normalize=self.normalize))
+          return self._words
+
+     # Lines property
+     @property
+     def lines(self):
+          """Every line of the text this region was diffed from."""
+          return self._lines
+
+     # Is empty method
+     def is_empty(self):
+          """Return True if no line was added or edited (lines may still have been removed)."""
+          return self.last_line < self.first_line
+
+     # Parts method
+     def parts(self, size):
+          """Split the region into parts of at most size lines, in document order."""
+          parts = []
+          for first in range(self.first_line - 1, self.last_line, size):
+               parts.append(DirtyRegion(first, min(first + size, self.last_line), self._lines, self.normalize))
+          return parts
+
+## ============================================================ ## DIRTY REGION TRACKER CLASS ## ============================================================ ##
+# Remembers the last checked text and reports only the lines that changed since then
+class DirtyRegionTracker:
+     # Constructor
+     def __init__(self, normalize=normalize_word):
+          self.lines = [""]
+          self.normalize = normalize
+
+     # Reset method
+     def reset(self):
+          self.lines = [""]
+
+     # Diff method
+     def diff(self, content):
+          """Return the DirtyRegion between the last committed pass and content, without recording it."""
+          new_lines = content.split("\n")
+          first, old_end, new_end = changed_lines(self.lines, new_lines)
+
+          # Only the changed lines are tokenized, when the region's words are first read
+          return DirtyRegion(first, new_end, new_lines, self.normalize)
+
+     # Commit method
+     def commit(self, region):
+          """Record a region as checked so the next diff starts from it."""
+          self.lines = region._lines
+
+     # Update method
+     def update(self, content):
+          """Diff content against the previous pass and record it in one step."""
+          region = self.diff(content)
+          self.commit(region)
+          return region
@@ -0,0 +1,147 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Folding rule shared with the tokenizer (queries arrive folded)
+from tokenizer import normalize_word
+
+## ============================================================ ## LEVENSHTEIN AUTOMATON CLASS ## ============================================================ ##
+# Lazily evaluated Levenshtein automaton for a single query word
+#
+# A state is the current row of the edit distance table, plus the previous row
+# and character (needed to recognise adjacent transpositions) and the number of
+# characters read so far. The automaton accepts every string within
+# max_distance edits of the query word.
+class LevenshteinAutomaton:
+     # Constructor
+     def __init__(self, word, max_distance=2, transpositions=True):
+          self.word = word
+          self.max_distance = max_distance
+          self.transpositions = transpositions
+
+     # Start state method
+     def start(self):
+          return (None, list(range(len(self.word) + 1)), None, 0)
+
+     # Step method
+     def step(self, state, char):
+          """Return the state reached by reading char."""
+          prev_row, row, prev_char, depth = state
+          word = self.word
+          limit = self.max_distance + 1
+          transpose = self.transpositions and prev_row is not None
+          depth += 1
+          new_row = [depth if depth < limit else limit]
+
+          # Cells further than max_distance from the diagonal can never be accepted,
+          # so only the band around it is computed and the rest is clamped to limit
+          low = min(max(1, depth - self.max_distance), len(word) + 1)
+          high = min(len(word), depth + self.max_distance)
+          new_row.extend([limit] * (low - 1))
+          for i in range(low, high + 1):
+               value = row[i - 1] if word[i - 1] == char else row[i - 1] + 1
+               if new_row[i - 1] + 1 < value:
+                    value = new_row[i - 1] + 1
+               if row[i] + 1 < value:
+                    value = row[i] + 1
+               # Adjacent transposition (optimal string alignment distance)
+               if (transpose and i > 1 and word[i - 1] == prev_char and word[i - 2] == char
+                         and prev_row[i - 2] + 1 < value):
+                    value = prev_row[i - 2] + 1
+               new_row.append(value if value < limit else limit)
+          new_row.extend([limit] * (len(word) - high))
+          return (row, new_row, char, depth)
+
+     # Is match method
+     def is_match(self, state):
+          return state[1][-1] <= self.max_distance
+
+     # Can match method
+     def can_match(self, state):
+          """Return True if some continuation of this state can still be accepted."""
+          return min(state[1]) <= self.max_distance
+
+     # Distance method
+     def distance(self, state):
+          return state[1][-1]
+
+## ============================================================ ## RANKING ## ============================================================ ##
+# Rank candidates method
+def rank_candidates(word, found, n=5, frequencies=None):
+     """Sort (candidate, distance, word ID) triples best first and return the top n as (candidate, distance).
+
+     Without frequencies the closest candidates come first, then the one whose
+     length is nearest the query. With a FrequencyTable the noisy-channel score
+     decides and the same order breaks ties. Spellings of one folded key
+     (ito'y and ito’y) take a single slot, the best ranked of them."""
+     if frequencies is None:
+          found.sort(key=lambda item: (item[1], abs(len(item[0]) - len(word)), item[0]))
+     else:
+          score = frequencies.score
+          found.sort(key=lambda item: (-score(item[2], item[1]), item[1], abs(len(item[0]) - len(word)), item[0]))
+     ranked = []
+     keys = set()
+     for candidate, distance, word_id in found:
+          key = normalize_word(candidate)
+          if key not in keys:
+               keys.add(key)
+               ranked.append((candidate, distance))
+               if len(ranked) == n:
+                    break
+     return ranked
+
+# Fold map method
+def fold_map(alphabet):
+     """Return {character: folded character} for the characters of a lexicon alphabet that fold to another single character (ñ -> n, ’ -> ')."""
+     folded = {}
+     for char in alphabet:
+          key = normalize_word(char)
+          if len(key) == 1 and key != char:
+               folded[char] = key
+     return folded
+
+## ============================================================ ## SUGGESTER CLASS ## ============================================================ ##
+# Suggestion engine that intersects a Levenshtein automaton with the DAWG lexicon
+#
+# Only the branches of the lexicon that stay within max_distance edits of the
+# query are visited, so the cost depends on the neighbourhood of the word
+# rather than on the number of words in the dictionary. Queries are folded
+# keys, so dictionary characters are folded the same way before they are
+# compared: "binan" is 0 edits from biñan, which is still what is suggested.
+class Suggester:
+     # Constructor
+     def __init__(self, lexicon, max_distance=2, transpositions=True, frequencies=None):
+          self.lexicon = lexicon
+          self.max_distance = max_distance
+          self.transpositions = transpositions
+          self.frequencies = frequencies  # Optional FrequencyTable for noisy-channel ranking
+          # Characters of the lexicon whose folded form is another single character (ñ -> n, ’ -> ')
+          self.folded = fold_map(lexicon.alphabet)
+
+     # Search method
+     def _search(self, word, max_distance=None):
+          """Return every (candidate, distance, word ID) triple in the lexicon within max_distance edits."""
+          if max_distance is None:
+               max_distance = self.max_distance
+          automaton = LevenshteinAutomaton(word, max_distance, self.transpositions)
+          lexicon = self.lexicon
+          folded = self.folded
+          found = []
+          # The word ID is carried along the walk (see DAWG.ranked_edges)
+          stack = [(0, "", automaton.start(), 0)]
+          while stack:
+               node, prefix, state, rank = stack.pop()
+               if lexicon.is_final(node) and automaton.is_match(state):
+                    found.append((prefix, automaton.distance(state), rank))
+               for char, child, child_rank in lexicon.ranked_edges(node, rank):
+                    next_state = automaton.step(state, folded.get(char, char))
+                    if automaton.can_match(next_state):
+                         stack.append((child, prefix + char, next_state, child_rank))
+          return found
+
+     # Candidates method
+     def candidates(self, word, max_distance=None):
+          """Return every (candidate, distance) pair in the lexicon within max_distance edits."""
+          return [(candidate, distance) for candidate, distance, word_id in self._search(word, max_distance)]
+
+     # Suggest method
+     def suggest(self, word, n=5, max_distance=None):
+          """Return up to n ranked (suggestion, distance) pairs for word."""
+          return rank_candidates(word, self._search(word, max_distance), n, self.frequencies)
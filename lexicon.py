@@ -0,0 +1,191 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# File and thread modules
+import os
+import threading
+
+# Folding rule shared with the tokenizer
+from tokenizer import normalize_word
+
+# Personal word log entries: one word per line, prefixed by the action
+ADD = "+"
+IGNORE = "!"
+REMOVE = "-"
+
+# Personal word list path method
+def default_personal_path(file_path):
+     """Return the personal word log path that sits next to a word list."""
+     return os.path.splitext(file_path)[0] + ".personal"
+
+## ============================================================ ## PERSONAL WORD LIST CLASS ## ============================================================ ##
+# Words the user added to the dictionary or chose to ignore, kept in an append-only log
+#
+# Every change appends one line ("+word", "!word" or "-word") and the current
+# state is the replay of the whole log, so a crash can lose at most the last
+# line and nothing is ever rewritten in place. Added and ignored words are both
+# accepted; they are kept apart so added words can later be merged into
+# filipino_dict.txt.
+class PersonalWordList:
+     # Constructor
+     def __init__(self, path=None):
+          self.path = path
+          self.added = set()
+          self.ignored = set()
+          self.lock = threading.Lock()
+          if path is not None and os.path.exists(path):
+               with open(path, "r", encoding="utf-8") as file:
+                    for line in file:
+                         self._apply(line[:1], line[1:].rstrip("\n"))
+
+     # Apply method
+     def _apply(self, action, word):
+          word = normalize_word(word)  # Logs written before folding hold curly apostrophes and accents
+          if not word:
+               return
+          if action == ADD:
+               self.added.add(word)
+               self.ignored.discard(word)
+          elif action == IGNORE:
+               self.ignored.add(word)
+          elif action == REMOVE:
+               self.added.discard(word)
+               self.ignored.discard(word)
+
+     # Append method
+     def _append(self, action, word):
+          with self.lock:
+               # Log first, so the in-memory state never gets ahead of the file
+               if self.path is not None:
+                    with open(self.path, "a", encoding="utf-8") as file:
+                         file.write(f"{action}{word}\n")
+               self._apply(action, word)
+
+     # Add method
+     def add(self, word):
+          self._append(ADD, word)
+
+     # Ignore method
+     def ignore(self, word):
+          self._append(IGNORE, word)
+
+     # Remove method
+     def remove(self, word):
+          self._append(REMOVE, word)
+
+     # Membership method
+     def __contains__(self, word):
+          return word in self.added or word in self.ignored
+
+     # Length method
+     def __len__(self):
+          return len(self.added) + len(self.ignored)
+
+## ============================================================ ## LAYERED LEXICON CLASS ## ============================================================ ##
+# The base dictionary with the personal word list layered over it
+#
+# The base is one DAWG compiled from every word list (Tagalog, English, domain
+# terms, see checker.layer_paths) whose final states carry a bitmask of the
+# lists that have the word. A lookup is one walk plus one AND with the mask of
+# the enabled layers, so turning a layer off for a document costs nothing
+# beyond clearing cached results.
+#
+# `base` is replaced in one assignment when filipino_dict.txt is reloaded, so
+# a lookup sees either the old or the new dictionary, never a mix, and checks
+# already running simply finish against the old one. Personal words are a set
+# lookup and never require rebuilding the base automaton.
+class LayeredLexicon:
+     # Constructor
+     def __init__(self, base, personal=None, layers=None):
+          self.personal = personal if personal is not None else PersonalWordList()
+          self.selected = None if layers is None else tuple(layers)  # Enabled layer names (None: all)
+          self.base = base
+
+     # Base property
+     @property
+     def base(self):
+          return self._base
+
+     @base.setter
+     def base(self, base):
+          # A reloaded dictionary may have lost a layer; keep the selected ones it still has
+          selected = None if self.selected is None else [name for name in self.selected if name in base.layers]
+          self.enabled = self._mask(base, selected)
+          self._base = base
+
+     # Mask method
+     @staticmethod
+     def _mask(base, names):
+          if names is None:
+               return 0xFF
+          unknown = set(names) - set(base.layers)
+          if unknown:
+               raise ValueError(f"Unknown dictionary layer(s): {', '.join(sorted(unknown))}")
+          return sum(1 << base.layers.index(name) for name in set(names))
+
+     # Layer names property
+     @property
+     def layers(self):
+          """Names of every layer of the base dictionary."""
+          return self._base.layers
+
+     # Set layers method
+     def set_layers(self, names=None):
+          """Accept words from these layers only (None: every layer); the personal list always applies."""
+          self.enabled = self._mask(self._base, names)
+          self.selected = None if names is None else tuple(names)
+
+     # Membership method
+     def __contains__(self, word):
+          return word in self.personal or self._base.mask(word) & self.enabled != 0
+
+     # Layer method
+     def layer(self, word):
+          """Return the name of the first enabled layer that lists word ("personal" for the personal list), or None."""
+          if word in self.personal:
+               return "personal"
+          mask = self._base.mask(word) & self.enabled
+          if not mask:
+               return None
+          bit = (mask & -mask).bit_length() - 1
+          return self._base.layers[bit] if bit < len(self._base.layers) else "dictionary"
+
+     # Canonical method
+     def canonical(self, word):
+          """Return the spelling that accepted a folded key (the key itself for personal words), or None."""
+          if word in self.personal:
+               return word
+          if self._base.mask(word) & self.enabled:
+               return self._base.canonical(word)
+          return None
+
+     # Length method
+     def __len__(self):
+          return len(self.base) + len(self.personal.added)
+
+     # Iterator method
+     def __iter__(self):
+          return iter(self.base)
+
+## ============================================================ ## DICTIONARY WATCHER CLASS ## ============================================================ ##
+# Notices when a word list on disk changes
+class DictionaryWatcher:
+     # Constructor
+     def __init__(self, *paths):
+          self.paths = paths
+          self.signature = self._stat()
+
+     # Stat method
+     def _stat(self):
+          try:
+               stats = [os.stat(path) for path in self.paths]
+          except OSError:
+               return None
+          return [(stat.st_size, stat.st_mtime_ns) for stat in stats]
+
+     # Changed method
+     def changed(self):
+          """Return True once for every change to the files since the last call."""
+          signature = self._stat()
+          if signature is None or signature == self.signature:
+               return False
+          self.signature = signature
+          return True
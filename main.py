@@ -21,8 +21,14 @@ from tkinter.scrolledtext import ScrolledText
 import nltk
 from nltk.corpus import words 
 
-# Function to check if the word is valid
-nltk.download('words')
+# Download the word list only if it is not installed yet
+try:
+    nltk.data.find('corpora/words')
+except LookupError:
+    nltk.download('words')
+
+# Build the lookup set once instead of scanning words.words() for every word
+word_set = set(words.words())
 
 class SpellChecker:
     # Constructor
@@ -54,7 +60,7 @@ class SpellChecker:
 
             for word in content.split(" "):
                 # Check if the word is not in the dictionary
-                if re.sub(r"[^\w]", "", word.lower()) not in words.words():
+                if re.sub(r"[^\w]", "", word.lower()) not in word_set:
                     position = content.find(word)
                     self.text.tag_add(word, f"1.{position}", f"1.{position + len(word)}")
                     self.text.tag_config(word, foreground="red")
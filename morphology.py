@@ -0,0 +1,162 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Named tuple for analyses
+from collections import namedtuple
+
+## ============================================================ ## AFFIX TABLES ## ============================================================ ##
+# Prefixes, longest first (stacked prefixes such as nagpa- + ka- are stripped one at a time)
+PREFIXES = ("pakikipag", "makipag", "nakipag", "makapag", "nakapag", "magpaka", "nagpaka", "pinaka",
+            "magpa", "nagpa", "ipag", "maka", "naka", "paki", "taga", "mang", "nang", "pang",
+            "mag", "nag", "pag", "ipa", "ika", "tag", "ma", "na", "pa", "ka", "um", "in", "i")
+
+# Prefixes that only stand directly before the root (in-, um- before vowels) or first in the word (i-)
+VOWEL_PREFIXES = ("um", "in")
+OUTER_PREFIXES = ("i", "um", "in")
+
+# Prefixes that trigger nasal substitution: ma- + pili -> mamili, ma- + tahi -> manahi, ma- + kuha -> manguha
+NASAL_PREFIXES = ("ma", "na", "pa")
+
+# Nasal-initial stems and the consonants they may have replaced ("" for a vowel-initial root)
+NASAL_SOURCES = (("ng", ("k", "")), ("m", ("p", "b")), ("n", ("t", "s", "d")))
+
+# Infixes, inserted after the first consonant of the root (kain -> kumain, kinain)
+INFIXES = ("um", "in")
+
+# Suffixes; the h- and n- forms follow vowel-final roots (basa -> basahin)
+SUFFIXES = ("han", "hin", "nan", "nin", "an", "in")
+
+VOWELS = frozenset("aeiou")
+
+# States of the analyzer, in the order they are visited (every state can also be skipped)
+LINKER, SUFFIX, PREFIX, INFIX, REDUPLICATION, NASAL, ROOT = range(7)
+
+## ============================================================ ## ANALYSIS CLASS ## ============================================================ ##
+# A root found in the lexicon and the affixes stripped to reach it, outermost first
+#
+#   mag-, pinaka-   prefixes         <um>, <in>   infixes
+#   -an, -hin       suffixes         -ng, -g      linkers
+#   RED             reduplication    NAS          nasal substitution
+class Analysis(namedtuple("Analysis", "root affixes")):
+     __slots__ = ()
+
+     # String method
+     def __str__(self):
+          return f"{self.root} ({', '.join(self.affixes)})"
+
+## ============================================================ ## MORPHOLOGY ANALYZER CLASS ## ============================================================ ##
+# Finite-state analyzer for Tagalog affixation and reduplication
+#
+# The analyzer runs right to left through the word's layers: the linker, one
+# suffix, up to max_prefixes prefixes, one infix, partial (first syllable) or
+# full (hyphenated) reduplication and nasal substitution. Each state maps a
+# stem to the stems it can come from, so the whole search is a small finite
+# transducer from surface forms to (root, affixes). A word is accepted when some
+# path ends at a root of at least min_root characters that is in the lexicon.
+#
+# An analyzer can stand in for its lexicon: `word in analyzer` accepts listed
+# words and analysable inflections, while len() and iteration stay those of
+# the lexicon.
+class MorphologyAnalyzer:
+     # Constructor
+     def __init__(self, lexicon, min_root=3, max_prefixes=2):
+          self.lexicon = lexicon
+          self.min_root = min_root
+          self.max_prefixes = max_prefixes
+
+     # Contains method
+     def __contains__(self, word):
+          return word in self.lexicon or self.analyze(word) is not None
+
+     # Length method
+     def __len__(self):
+          return len(self.lexicon)
+
+     # Iterator method
+     def __iter__(self):
+          return iter(self.lexicon)
+
+     # Analyze method
+     def analyze(self, word):
+          """Return the first Analysis of an unlisted word, or None."""
+          for analysis in self.analyses(word):
+               return analysis
+          return None
+
+     # Analyses method
+     def analyses(self, word):
+          """Yield every Analysis of word whose root is in the lexicon (the word itself excluded)."""
+          stack = [(LINKER, word, (), 0, False)]
+          seen = set()
+          while stack:
+               state, stem, affixes, prefixes, nasal = stack.pop()
+               key = (state, stem, prefixes, nasal)
+               if key in seen:
+                    continue
+               seen.add(key)
+               if state == ROOT:
+                    if stem != word and len(stem) >= self.min_root and stem in self.lexicon:
+                         yield Analysis(stem, affixes)
+                    continue
+               # Skipping a state is always allowed
+               stack.append((state + 1, stem, affixes, prefixes, nasal))
+               for source, affix, next_state in self._transitions(state, stem, prefixes, nasal):
+                    stack.append((next_state, source, affixes + (affix,),
+                                  prefixes + (state == PREFIX),
+                                  affix[:-1] in NASAL_PREFIXES if state == PREFIX else nasal))
+
+     # Transitions method
+     def _transitions(self, state, stem, prefixes, nasal):
+          """Return (source stem, affix, next state) for every way state can strip an affix from stem."""
+          transitions = []
+          if state == LINKER:
+               # -ng after a vowel (magandang), -g after n (bayang)
+               if len(stem) > 3 and stem.endswith("ng") and stem[-3] in VOWELS:
+                    transitions.append((stem[:-2], "-ng", SUFFIX))
+               if len(stem) > 3 and stem.endswith("ng") and stem[-3] == "n":
+                    transitions.append((stem[:-1], "-g", SUFFIX))
+          elif state == SUFFIX:
+               for suffix in SUFFIXES:
+                    if stem.endswith(suffix) and len(stem) - len(suffix) >= 2:
+                         source = stem[:-len(suffix)]
+                         transitions.append((source, f"-{suffix}", PREFIX))
+                         # Final o is raised to u before a suffix (inom -> inumin)
+                         if len(source) > 2 and source[-2] == "u" and source[-1] not in VOWELS:
+                              transitions.append((source[:-2] + "o" + source[-1], f"-{suffix}", PREFIX))
+          elif state == PREFIX:
+               if prefixes < self.max_prefixes:
+                    for prefix in PREFIXES:
+                         if not stem.startswith(prefix) or len(stem) <= len(prefix) + 1:
+                              continue
+                         if prefixes and prefix in OUTER_PREFIXES:
+                              continue
+                         if prefix in VOWEL_PREFIXES and stem[len(prefix)] not in VOWELS:
+                              continue
+                         source = stem[len(prefix):]
+                         # mag-aral: the hyphen separates a prefix from a vowel-initial root
+                         if source[0] == "-":
+                              source = source[1:]
+                         next_state = PREFIX if prefixes + 1 < self.max_prefixes else INFIX
+                         transitions.append((source, f"{prefix}-", next_state))
+          elif state == INFIX:
+               if len(stem) > 3 and stem[0] not in VOWELS:
+                    for infix in INFIXES:
+                         if stem[1:3] == infix:
+                              transitions.append((stem[0] + stem[3:], f"<{infix}>", REDUPLICATION))
+               # -in- becomes ni- before l and y (nilinis, niyakap)
+               if len(stem) > 3 and stem.startswith("ni") and stem[2] in "ly":
+                    transitions.append((stem[2:], "<in>", REDUPLICATION))
+          elif state == REDUPLICATION:
+               # Partial: the first (C)V syllable is repeated (kakain, aaral, lalaro)
+               syllable = stem[:1] if stem[:1] in VOWELS else stem[:2]
+               if len(syllable) and syllable[-1] in VOWELS and stem[len(syllable):].startswith(syllable):
+                    transitions.append((stem[len(syllable):], "RED", NASAL))
+               # Full: the whole stem is repeated around a hyphen (araw-araw, sira-sira)
+               left, hyphen, right = stem.partition("-")
+               if hyphen and left == right:
+                    transitions.append((right, "RED", NASAL))
+          elif state == NASAL and nasal:
+               for nasal_start, sources in NASAL_SOURCES:
+                    if stem.startswith(nasal_start) and len(stem) > len(nasal_start) + 1:
+                         for source in sources:
+                              transitions.append((source + stem[len(nasal_start):], "NAS", ROOT))
+                         break
+          return transitions
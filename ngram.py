@@ -0,0 +1,306 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Command-line module
+import argparse
+import sys
+
+# Array, search and math modules for the compact model
+from array import array
+from bisect import bisect_left
+import math
+
+# Modules for the on-disk model
+import os
+import struct
+
+# Shared memory-mapped image format
+from image import check_lexicon, corpus_lines, lexicon_digest, load_optional, map_image, write_image
+
+# Shared tokenizer
+from tokenizer import tokenize
+
+# On-disk model layout: [n-gram keys (uint64)][unigram levels (uint8 per word ID)][n-gram levels (uint8)][confusion sets (UTF-8)][trailer]
+# The trailer ends with the version and magic, like every image (see image.py).
+MODEL_MAGIC = b"FSMNGRM\0"
+MODEL_VERSION = 1
+MODEL_TRAILER = struct.Struct("<IIIQd32sI8s")  # lexicon words, n-grams, confusion bytes, corpus tokens, quantization step, lexicon SHA-256, version, magic
+
+# Dictionary words that are easily typed for one another (a set is dropped if fewer than two of its words are listed)
+DEFAULT_CONFUSION_SETS = (
+     ("ng", "nang"),
+     ("din", "rin"),
+     ("daw", "raw"),
+     ("doon", "roon"),
+     ("dito", "rito"),
+     ("diyan", "riyan"),
+     ("kung", "kong"),
+)
+
+# A token ending in one of these (closing quotes and brackets aside) ends its sentence
+SENTENCE_END = (".", "!", "?", "…")
+CLOSERS = "\"'”’)]"
+
+# Longest run of tokens held at once; longer sentences are scored in overlapping pieces
+SENTENCE_LIMIT = 256
+
+# Words on either side of a word that its score depends on (order - 1 for trigrams)
+CONTEXT = 2
+
+# Stupid backoff penalty (log10 of 0.4) for every order the model backs off
+BACKOFF = math.log10(0.4)
+
+# Model path method
+def default_model_path(file_path):
+     """Return the n-gram model path that sits next to a word list."""
+     return os.path.splitext(file_path)[0] + ".ngram"
+
+# Sentences method
+def sentences(tokens, limit=SENTENCE_LIMIT):
+     """Group Tokens into sentences, which end at a line break or after a token ending in . ! ? or …
+
+     Yield (sentence, start, stop): the tokens sentence[start:stop] are new and
+     the ones around them are context only. A sentence of more than limit tokens
+     (text without punctuation or line breaks) is cut into pieces of limit tokens
+     that overlap by 2 * CONTEXT, so no more than limit tokens are ever held and
+     every word is still scored with the CONTEXT words on either side of it."""
+     sentence = []
+     start = 0
+     for token in tokens:
+          if sentence and (token.line != sentence[-1].line or sentence[-1].token.rstrip(CLOSERS).endswith(SENTENCE_END)):
+               yield sentence, start, len(sentence)
+               sentence = []
+               start = 0
+          elif len(sentence) >= max(limit, 2 * CONTEXT + 1):
+               # The last CONTEXT words lack their right context, so the next piece scores them
+               yield sentence, start, len(sentence) - CONTEXT
+               sentence = sentence[-2 * CONTEXT:]
+               start = CONTEXT
+          sentence.append(token)
+     if sentence:
+          yield sentence, start, len(sentence)
+
+## ============================================================ ## N-GRAM MODEL CLASS ## ============================================================ ##
+# Quantized bigram/trigram model keyed by the lexicon's word IDs, for real-word errors
+#
+# Every word is in the dictionary, so only context can tell "ng" from "nang".
+# For each word of a sentence that belongs to a confusion set, the model scores
+# the words whose context includes it (itself and the next two) once as typed
+# and once with every other word of its set in its place; a replacement that
+# is more than threshold (log10 units) likelier is reported.
+#
+# N-grams are packed into one sorted array of 64-bit keys, three word IDs of
+# `bits` bits each (ID + 1, so 0 means "no word" and bigrams are trigrams with
+# an empty first slot). Log-probabilities are quantized to one byte, so an
+# n-gram costs 9 bytes and the file is memory-mapped as is. Unseen n-grams fall
+# back to the next order with the stupid backoff penalty.
+class NgramModel:
+     # Constructor
+     def __init__(self, lexicon, keys, levels, unigrams, step, confusion_sets, total, threshold=1.0):
+          self.lexicon = lexicon
+          self.keys = keys  # Sorted n-gram keys
+          self.levels = levels  # Quantized log-probability of every key
+          self.unigrams = unigrams  # Quantized log-probability of every word ID
+          self.step = step
+          self.total = total
+          self.threshold = threshold
+          self.bits = len(lexicon).bit_length()
+          if 3 * self.bits > 64:
+               raise ValueError(f"{len(lexicon)} words do not fit in a 64-bit trigram key")
+          self._values = [-level * step for level in range(256)]  # Level -> log10 probability
+
+          # Confusable word -> the other listed words of its set
+          self.confusion_sets = []
+          self.confusions = {}
+          for words in confusion_sets:
+               words = tuple(word for word in words if lexicon.word_id(word) >= 0)
+               if len(words) < 2:
+                    continue
+               self.confusion_sets.append(words)
+               for word in words:
+                    self.confusions[word] = tuple(other for other in words if other != word)
+
+     # Build method
+     @classmethod
+     def build(cls, lexicon, lines, confusion_sets=DEFAULT_CONFUSION_SETS, min_count=1, threshold=1.0):
+          """Count the unigrams, bigrams and trigrams of dictionary words in lines and quantize their probabilities."""
+          bits = len(lexicon).bit_length()
+          unigrams = array("I", bytes(4 * len(lexicon)))
+          counts = {}
+          total = 0
+          for line in lines:
+               for sentence, start, stop in sentences(tokenize(line)):
+                    ids = [lexicon.word_id(token.normalized) for token in sentence]
+                    for i in range(start, stop):
+                         a, b, c = ids[i - 2] if i >= 2 else -1, ids[i - 1] if i >= 1 else -1, ids[i]
+                         if c >= 0:
+                              unigrams[c] += 1
+                              total += 1
+                              if b >= 0:
+                                   key = (b + 1) << bits | (c + 1)
+                                   counts[key] = counts.get(key, 0) + 1
+                                   if a >= 0:
+                                        key |= (a + 1) << 2 * bits
+                                        counts[key] = counts.get(key, 0) + 1
+
+          # Conditional log10 probabilities: P(c | b) = n(b c) / n(b) and P(c | a b) = n(a b c) / n(a b)
+          mask = (1 << 2 * bits) - 1
+          keys = sorted(key for key, count in counts.items() if count >= min_count)
+          logprobs = []
+          for key in keys:
+               context = key >> bits
+               history = counts[context] if context >> bits else unigrams[(context & mask) - 1]
+               logprobs.append(math.log10(counts[key] / history))
+          vocabulary = total + len(lexicon)
+          word_logprobs = [math.log10((count + 1) / vocabulary) for count in unigrams]
+
+          # One byte per probability: 256 evenly spaced levels from 0 down to the rarest word
+          step = -min(word_logprobs + logprobs, default=-1.0) / 255 or 1.0
+          levels = array("B", (min(255, round(-logprob / step)) for logprob in logprobs))
+          word_levels = array("B", (min(255, round(-logprob / step)) for logprob in word_logprobs))
+          return cls(lexicon, array("Q", keys), levels, word_levels, step, confusion_sets, total, threshold)
+
+     # N-gram method
+     def _ngram(self, key):
+          i = bisect_left(self.keys, key)
+          if i < len(self.keys) and self.keys[i] == key:
+               return self._values[self.levels[i]]
+          return None
+
+     # Log-probability method
+     def logprob(self, a, b, c):
+          """log10 P(c | a b) with stupid backoff; a and b are -1 where there is no (known) context word."""
+          bits = self.bits
+          penalty = 0.0
+          if b >= 0:
+               key = (b + 1) << bits | (c + 1)
+               if a >= 0:
+                    value = self._ngram(key | (a + 1) << 2 * bits)
+                    if value is not None:
+                         return value
+                    penalty = BACKOFF
+               value = self._ngram(key)
+               if value is not None:
+                    return value + penalty
+               penalty += BACKOFF
+          return self._values[self.unigrams[c]] + penalty
+
+     # Window score method
+     def _window(self, ids, i):
+          """Sum the log-probabilities of the words whose context includes position i."""
+          score = 0.0
+          for j in range(i, min(i + 3, len(ids))):
+               c = ids[j]
+               if c >= 0:  # An unknown word scores the same whatever is at position i
+                    score += self.logprob(ids[j - 2] if j >= 2 else -1, ids[j - 1] if j >= 1 else -1, c)
+          return score
+
+     # Check method
+     def check(self, sentence, start=0, stop=None):
+          """Return {index: replacement} for the words of one sentence (a list of Tokens) that another word of their confusion set fits better.
+
+          Only sentence[start:stop] is checked; the words around it are context."""
+          confusions = self.confusions
+          found = [i for i in range(start, len(sentence) if stop is None else stop) if sentence[i].normalized in confusions]
+          if not found:
+               return {}
+          word_id = self.lexicon.word_id
+          ids = [word_id(token.normalized) for token in sentence]
+          replacements = {}
+          for i in found:
+               typed = ids[i]
+               best, best_score = None, self._window(ids, i) + self.threshold
+               for word in confusions[sentence[i].normalized]:
+                    ids[i] = word_id(word)
+                    score = self._window(ids, i)
+                    if score > best_score:
+                         best, best_score = word, score
+               ids[i] = typed
+               if best is not None:
+                    replacements[i] = best
+          return replacements
+
+     # Check tokens method
+     def check_tokens(self, tokens):
+          """Return {index: replacement} over a list of Tokens, scored one sentence at a time."""
+          replacements = {}
+          position = 0  # Index in tokens of sentence[start]
+          for sentence, start, stop in sentences(tokens):
+               for i, word in self.check(sentence, start, stop).items():
+                    replacements[position + i - start] = word
+               position += stop - start
+          return replacements
+
+     # Length method
+     def __len__(self):
+          return len(self.keys)
+
+     # Memory usage method
+     def nbytes(self):
+          """Size of the keys and quantized probabilities in bytes."""
+          return len(self.keys) * 9 + len(self.unigrams)
+
+     # Save method
+     def save(self, path):
+          confusions = "\n".join(" ".join(words) for words in self.confusion_sets).encode("utf-8")
+          write_image(path, (array("Q", self.keys).tobytes(), bytes(self.unigrams), bytes(self.levels), confusions),
+                      MODEL_TRAILER.pack(len(self.unigrams), len(self.keys), len(confusions), self.total, self.step,
+                                         lexicon_digest(self.lexicon), MODEL_VERSION, MODEL_MAGIC))
+
+     # Open method
+     @classmethod
+     def open(cls, path, lexicon, threshold=1.0):
+          """Memory-map a model written by save() for the same lexicon."""
+          image, (word_count, ngram_count, confusion_size, total, step, digest, version, magic) = \
+               map_image(path, MODEL_MAGIC, MODEL_VERSION, MODEL_TRAILER, "bigram/trigram model")
+          # Keys are made of word IDs, so they only fit the word list they were built for
+          check_lexicon(path, lexicon, word_count, digest, "ngram.py")
+          view = memoryview(image)
+          keys = view[:ngram_count * 8].cast("Q")
+          offset = ngram_count * 8
+          unigrams = view[offset:offset + word_count]
+          offset += word_count
+          levels = view[offset:offset + ngram_count]
+          offset += ngram_count
+          confusions = bytes(view[offset:offset + confusion_size]).decode("utf-8")
+          confusion_sets = [line.split() for line in confusions.splitlines()]
+          return cls(lexicon, keys, levels, unigrams, step, confusion_sets, total, threshold)
+
+# Load model method
+def load_ngram_model(path, lexicon, threshold=1.0):
+     """Return the n-gram model at path, or None if there is none or it does not fit the lexicon."""
+     return load_optional(path, "bigram/trigram model", NgramModel.open, lexicon, threshold)
+
+# Load confusion sets method
+def load_confusion_sets(path):
+     """Read confusion sets from a text file: one set per line, its words separated by whitespace."""
+     with open(path, "r", encoding="utf-8") as file:
+          return [line.split() for line in file if len(line.split()) > 1]
+
+## ============================================================ ## COMMAND LINE ## ============================================================ ##
+# Main method
+def main(argv=None):
+     from checker import file_path, load_dictionary
+
+     parser = argparse.ArgumentParser(description="Build the n-gram model used to catch real-word errors such as 'ng' for 'nang'.")
+     parser.add_argument("corpus", nargs="+", help="UTF-8 text files of correct Tagalog text")
+     parser.add_argument("--dictionary", default=file_path, help="word list the model is keyed by")
+     parser.add_argument("--output", help="model path (default: next to the dictionary)")
+     parser.add_argument("--confusions", help="confusion sets, one per line (default: ng/nang, din/rin, daw/raw, ...)")
+     parser.add_argument("--min-count", type=int, default=1, help="drop bigrams and trigrams seen fewer times than this")
+     args = parser.parse_args(argv)
+
+     lexicon = load_dictionary(args.dictionary)
+     try:
+          confusion_sets = load_confusion_sets(args.confusions) if args.confusions else DEFAULT_CONFUSION_SETS
+          model = NgramModel.build(lexicon, corpus_lines(args.corpus), confusion_sets, args.min_count)
+     except OSError as e:
+          print(f"[ERROR] {e}", file=sys.stderr)
+          return 1
+     output = args.output or default_model_path(args.dictionary)
+     model.save(output)
+     print(f"[STATUS]: Stored {len(model)} bigrams and trigrams from {model.total} tokens "
+           f"({model.nbytes() // 1024} KB, {len(model.confusion_sets)} confusion sets) in '{output}'.")
+     return 0
+
+## ============================================================ ## BUILD THE MODEL ## ============================================================ ##
+if __name__ == "__main__":
+     sys.exit(main())
@@ -0,0 +1,103 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Process pool and file modules
+import io
+import multiprocessing
+import os
+
+# Memory-mapped dictionary image
+from dawg import DAWG
+
+# Headless checker and its output format
+from checker import Checker, format_results
+
+## ============================================================ ## SHARDING ## ============================================================ ##
+# Plan shards method
+def plan_shards(name, shard_size):
+     """Split a file into (name, start, end) byte ranges that end on line boundaries."""
+     shards = []
+     size = os.path.getsize(name)
+     with open(name, "rb") as file:
+          start = 0
+          while start < size:
+               end = min(start + shard_size, size)
+               if end < size:
+                    # Extend the shard to the end of the line it stops in
+                    file.seek(end)
+                    file.readline()
+                    end = file.tell()
+               shards.append((name, start, end))
+               start = end
+     return shards
+
+# Read shard method
+def read_shard(shard):
+     """Return the lines of a shard, decoded the same way open(..., "r") would."""
+     name, start, end = shard
+     with open(name, "rb") as file:
+          file.seek(start)
+          data = file.read(end - start)
+     return io.TextIOWrapper(io.BytesIO(data), encoding="utf-8").readlines()
+
+## ============================================================ ## WORKER PROCESS ## ============================================================ ##
+# Per-process checker, created once by the pool initializer
+_checker = None
+_invalid_only = False
+
+# Worker initializer method
+def _init_worker(image_path, suggest, max_suggestions, max_distance, cache_size, invalid_only, morphology,
+                 backend, index_path, prefix_length, frequencies_path, personal_path, layers, ngram_path):
+     global _checker, _invalid_only
+     # Every worker maps the same read-only image instead of re-reading the word list
+     _checker = Checker(DAWG.open(image_path), suggest=suggest, max_suggestions=max_suggestions,
+                        max_distance=max_distance, cache_size=cache_size, morphology=morphology,
+                        backend=backend, index_path=index_path, prefix_length=prefix_length,
+                        frequencies_path=frequencies_path, personal_path=personal_path, layers=layers,
+                        ngram_path=ngram_path)
+     _invalid_only = invalid_only
+
+# Count shard method
+def _count_shard(shard):
+     """Return the number of lines and characters in a shard."""
+     lines = read_shard(shard)
+     return len(lines), sum(map(len, lines))
+
+# Check shard method
+def _check_shard(job):
+     """Check one shard and return its results already rendered as JSON lines."""
+     shard, line_number, offset = job
+     results = _checker.check_lines(read_shard(shard), line_number, offset)
+     return format_results(results, shard[0], _invalid_only)
+
+## ============================================================ ## PARALLEL CHECK ## ============================================================ ##
+# Check files method
+def check_files(files, image_path, jobs=None, shard_size=4 << 20, suggest=False,
+                max_suggestions=5, max_distance=2, cache_size=100000, invalid_only=False, morphology=True,
+                backend="automaton", index_path=None, prefix_length=10, frequencies_path=None, personal_path=None,
+                layers=None, ngram_path=None):
+     """Check files across a process pool and yield JSON-lines output in input order.
+
+     Files are cut into line-aligned shards. A first pass counts the lines and
+     characters of every shard so that each worker can report absolute line
+     numbers and offsets; the second pass checks the shards and the rendered
+     results are yielded in the original order."""
+     shards = [shard for name in files for shard in plan_shards(name, shard_size)]
+     if not shards:
+          return
+
+     initargs = (image_path, suggest, max_suggestions, max_distance, cache_size, invalid_only, morphology,
+                 backend, index_path, prefix_length, frequencies_path, personal_path, layers, ngram_path)
+     with multiprocessing.Pool(jobs, initializer=_init_worker, initargs=initargs) as pool:
+          counts = pool.map(_count_shard, shards, chunksize=1)
+
+          # Starting line number and offset of every shard within its own file
+          work = []
+          previous_name = None
+          for shard, (line_count, char_count) in zip(shards, counts):
+               if shard[0] != previous_name:
+                    line_number, offset = 1, 0
+                    previous_name = shard[0]
+               work.append((shard, line_number, offset))
+               line_number += line_count
+               offset += char_count
+
+          yield from pool.imap(_check_shard, work, chunksize=1)
@@ -0,0 +1,153 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Profiling and timing modules
+import cProfile
+import io
+import pstats
+import time
+
+# Thread module for the shared counters
+import threading
+
+## ============================================================ ## HISTOGRAM CLASS ## ============================================================ ##
+# Log-bucketed latency histogram in nanoseconds
+#
+# Every power of two is split into four buckets, so a percentile is known to
+# within about 20% while recording costs a few integer operations and memory
+# stays fixed however many samples arrive.
+class Histogram:
+     __slots__ = ("counts", "count", "total", "max")
+
+     # Constructor
+     def __init__(self):
+          self.counts = [0] * 260
+          self.count = 0
+          self.total = 0
+          self.max = 0
+
+     # Record method
+     def record(self, ns):
+          bits = ns.bit_length()
+          self.counts[ns if bits <= 3 else bits * 4 + (ns >> (bits - 3)) - 4] += 1
+          self.count += 1
+          self.total += ns
+          if ns > self.max:
+               self.max = ns
+
+     # Percentile method
+     def percentile(self, fraction):
+          """Return the upper bound in nanoseconds of the bucket holding this fraction of the samples."""
+          rank = fraction * self.count
+          seen = 0
+          for bucket, count in enumerate(self.counts):
+               seen += count
+               if count and seen >= rank:
+                    if bucket < 8:
+                         return bucket
+                    bits, top = divmod(bucket, 4)
+                    return min(((top + 5) << (bits - 3)) - 1, self.max)
+          return 0
+
+## ============================================================ ## PROFILER CLASS ## ============================================================ ##
+# Per-stage timers, counters and an optional cProfile capture for the check pipeline
+#
+# Callers check `enabled` before timing anything, like the trace sinks, so a
+# disabled profiler costs one attribute read per call site:
+#     if profiler.enabled:
+#          started = time.perf_counter_ns()
+#     ...
+#     if profiler.enabled:
+#          profiler.record("lookup", started)
+class Profiler:
+     # Constructor
+     def __init__(self, enabled=False):
+          self.enabled = enabled
+          self.lock = threading.Lock()
+          self.capture = None
+          self.reset()
+
+     # Reset method
+     def reset(self):
+          with self.lock:
+               self.stages = {}
+               self.counters = {}
+               self.started = time.perf_counter()
+
+     # Enable method
+     def enable(self, enabled=True):
+          if enabled and not self.enabled:
+               self.reset()
+          self.enabled = enabled
+
+     # Record method
+     def record(self, stage, started_ns):
+          """Add the time since started_ns (from time.perf_counter_ns) to a stage."""
+          elapsed = time.perf_counter_ns() - started_ns
+          histogram = self.stages.get(stage)
+          if histogram is None:
+               with self.lock:
+                    histogram = self.stages.setdefault(stage, Histogram())
+          histogram.record(elapsed)
+
+     # Count method
+     def count(self, counter, n=1):
+          self.counters[counter] = self.counters.get(counter, 0) + n
+
+     # Stats method
+     def stats(self):
+          """Return the counters and per-stage calls, totals and p50/p95/p99/max in milliseconds."""
+          stages = {}
+          for stage, histogram in sorted(self.stages.items()):
+               stages[stage] = {
+                    "calls": histogram.count,
+                    "total_ms": histogram.total / 1e6,
+                    "p50_ms": histogram.percentile(0.50) / 1e6,
+                    "p95_ms": histogram.percentile(0.95) / 1e6,
+                    "p99_ms": histogram.percentile(0.99) / 1e6,
+                    "max_ms": histogram.max / 1e6,
+               }
+          return {"seconds": time.perf_counter() - self.started, "counters": dict(self.counters), "stages": stages}
+
+     # Report method
+     def report(self):
+          """Return the stats as a text table."""
+          stats = self.stats()
+          counters = ", ".join(f"{name}: {value}" for name, value in sorted(stats["counters"].items()))
+          lines = [f"[PROFILE]: {stats['seconds']:.1f} s" + (f", {counters}" if counters else ""),
+                   f"{'stage':<12}{'calls':>9}{'total ms':>11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"]
+          for stage, row in stats["stages"].items():
+               lines.append(f"{stage:<12}{row['calls']:>9}{row['total_ms']:>11.1f}{row['p50_ms']:>9.3f}"
+                            f"{row['p95_ms']:>9.3f}{row['p99_ms']:>9.3f}{row['max_ms']:>9.3f}")
+          return "\n".join(lines) + "\n"
+
+     # Dump method
+     def dump(self, write=None, path=None):
+          """Write the report to a callable (such as the terminal pane's write) and/or append it to a file."""
+          text = self.report()
+          if write is not None:
+               write(text)
+          if path is not None:
+               with open(path, "a", encoding="utf-8") as file:
+                    file.write(text)
+          return text
+
+     # Toggle capture method
+     def toggle_capture(self, path=None, limit=20):
+          """Start a cProfile capture of the calling thread, or stop it and return the top functions.
+
+          The capture only sees the thread it was started on (the Tk thread in
+          the GUI). When stopping, the raw profile is saved to path if given,
+          for snakeviz or pstats."""
+          if self.capture is None:
+               self.capture = cProfile.Profile()
+               self.capture.enable()
+               return None
+          capture, self.capture = self.capture, None
+          capture.disable()
+          if path is not None:
+               capture.dump_stats(path)
+          out = io.StringIO()
+          pstats.Stats(capture, stream=out).sort_stats("cumulative").print_stats(limit)
+          return out.getvalue()
+
+# Shared profiler for the GUI, the worker thread and the headless checker (off until enabled)
+profiler = Profiler()
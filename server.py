@@ -0,0 +1,454 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Command-line, output and event loop modules
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+# Worker pools for suggestions
+import concurrent.futures
+import os
+
+# Bounded latency samples
+from collections import deque
+
+# Headless checker (same dictionary loader as spellchecker.py)
+from checker import Checker, default_index_path, ensure_image, file_path, layer_paths, load_dictionary
+from dawg import DAWG
+from frequency import default_table_path
+from lexicon import DictionaryWatcher, default_personal_path
+from tokenizer import tokenize
+
+# Largest request body accepted (bytes)
+MAX_BODY = 16 << 20
+
+## ============================================================ ## LATENCY METRICS CLASS ## ============================================================ ##
+# Request count, errors and latency percentiles for one endpoint
+class LatencyStats:
+     # Constructor
+     def __init__(self, samples=10000):
+          self.samples = deque(maxlen=samples)  # Most recent latencies in milliseconds
+          self.count = 0
+          self.errors = 0
+          self.total_ms = 0.0
+
+     # Record method
+     def record(self, elapsed_ms, error=False):
+          self.samples.append(elapsed_ms)
+          self.count += 1
+          self.total_ms += elapsed_ms
+          if error:
+               self.errors += 1
+
+     # Stats method
+     def stats(self):
+          ordered = sorted(self.samples)
+
+          def percentile(fraction):
+               return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+          return {
+               "count": self.count,
+               "errors": self.errors,
+               "mean_ms": self.total_ms / self.count if self.count else 0.0,
+               "p50_ms": percentile(0.50),
+               "p95_ms": percentile(0.95),
+               "p99_ms": percentile(0.99),
+               "max_ms": ordered[-1] if ordered else 0.0,
+          }
+
+## ============================================================ ## BATCHER CLASS ## ============================================================ ##
+# Coalesces concurrent requests into one batched lookup
+#
+# Every request submits a set of keys and waits. The batch loop wakes up on the
+# first submission, waits up to max_delay for more requests to arrive (or until
+# max_batch keys are pending), then runs process() once over the distinct keys
+# of all waiting requests and hands each request its share of the results.
+class Batcher:
+     # Constructor
+     def __init__(self, process, max_batch=4096, max_delay=0.002):
+          self.process = process  # async callable: list of distinct keys -> {key: result}
+          self.max_batch = max_batch
+          self.max_delay = max_delay
+          self.pending = []  # (keys, future)
+          self.pending_keys = 0
+          self.wakeup = asyncio.Event()
+          self.batches = 0
+          self.requests = 0
+          self.keys = 0
+
+     # Submit method
+     async def submit(self, keys):
+          future = asyncio.get_running_loop().create_future()
+          self.pending.append((keys, future))
+          self.pending_keys += len(keys)
+          self.wakeup.set()
+          return await future
+
+     # Run method
+     async def run(self):
+          while True:
+               await self.wakeup.wait()
+               # Give concurrent requests a moment to join the batch
+               if self.pending_keys < self.max_batch:
+                    await asyncio.sleep(self.max_delay)
+               batch, self.pending, self.pending_keys = self.pending, [], 0
+               self.wakeup.clear()
+
+               distinct = list(set().union(*(keys for keys, future in batch)))
+               self.batches += 1
+               self.requests += len(batch)
+               self.keys += len(distinct)
+               try:
+                    results = await self.process(distinct)
+               except Exception as e:
+                    for keys, future in batch:
+                         if not future.done():
+                              future.set_exception(e)
+                    continue
+               for keys, future in batch:
+                    if not future.done():
+                         future.set_result({key: results[key] for key in keys})
+
+     # Stats method
+     def stats(self):
+          return {
+               "batches": self.batches,
+               "requests": self.requests,
+               "requests_per_batch": self.requests / self.batches if self.batches else 0.0,
+               "keys_per_batch": self.keys / self.batches if self.batches else 0.0,
+          }
+
+## ============================================================ ## SUGGESTION WORKERS ## ============================================================ ##
+# Per-process checker, created once by the pool initializer
+_checker = None
+
+# Worker initializer method
+def _init_worker(image_path, checker_options):
+     global _checker
+     # Every worker maps the same read-only image (and SymSpell index) as the server
+     _checker = Checker(DAWG.open(image_path), **checker_options)
+
+# Suggest words method
+def _suggest_words(words):
+     """Return {word: suggestions} for a chunk of normalized words."""
+     return {word: _checker.get_suggestions(word) for word in words}
+
+## ============================================================ ## REQUEST VALIDATION ## ============================================================ ##
+# A JSON request whose fields have the wrong type or range; answered with 400
+class RequestError(ValueError):
+     pass
+
+# String list method
+def string_list(request, key):
+     """Return request[key] (default: empty) after checking that it is a list of strings."""
+     values = request.get(key, [])
+     if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+          raise RequestError(f'"{key}" must be a list of strings')
+     return values
+
+# Content length method
+def content_length(headers):
+     """Return the Content-Length header as an int (0 if absent), rejecting anything but plain decimal digits."""
+     value = headers.get("content-length", "")
+     if not value:
+          return 0
+     # int() would also take signs, underscores and non-ASCII digits
+     if not (value.isascii() and value.isdigit()):
+          raise RequestError(f"Invalid Content-Length {value!r}")
+     return int(value)
+
+## ============================================================ ## SPELL CHECK SERVICE CLASS ## ============================================================ ##
+# Shared warm dictionary behind a small HTTP/JSON API
+#
+#   POST /check    {"text": "..."} or {"words": [...]}, optional "suggest": true
+#   POST /suggest  {"words": [...]}, optional "n"
+#   POST /words    {"add": [...], "ignore": [...]} updates the personal word list
+#   GET  /metrics  per-endpoint latency, batching and cache counters
+#   GET  /health
+class SpellCheckService:
+     # Constructor
+     def __init__(self, dictionary=file_path, workers=None, max_suggestions=5, max_batch=4096, max_delay=0.002,
+                  backend="automaton", prefix_length=10, morphology=True, layers=None):
+          self.dictionary = dictionary
+          self.image_path = ensure_image(dictionary)
+          self.checker_options = checker_options = {
+               "max_suggestions": max_suggestions,
+               "morphology": morphology,
+               "backend": backend,
+               "index_path": default_index_path(dictionary),
+               "prefix_length": prefix_length,
+               "frequencies_path": default_table_path(dictionary),
+               "personal_path": default_personal_path(dictionary),
+               "layers": layers,
+          }
+          self.checker = Checker(load_dictionary(dictionary), **checker_options)
+          self.max_suggestions = max_suggestions
+          if backend == "symspell":
+               self.checker.suggester  # Build the index once here so the workers only have to map it
+
+          self.workers = workers if workers is not None else os.cpu_count() or 1
+          self.pool = self._start_pool()
+          self.watcher = DictionaryWatcher(*[path for name, path in layer_paths(dictionary)])
+          self.check_batcher = Batcher(self._check_batch, max_batch, max_delay)
+          self.suggest_batcher = Batcher(self._suggest_batch, max_batch, max_delay)
+          self.latency = {}
+
+     # Start pool method
+     def _start_pool(self):
+          """Suggestions are CPU-bound, so they run in worker processes; workers=0 keeps them in a thread."""
+          if self.workers == 0:
+               self.suggest_words = lambda words: {word: self.checker.get_suggestions(word) for word in words}
+               return concurrent.futures.ThreadPoolExecutor(1)
+          self.suggest_words = _suggest_words
+          return concurrent.futures.ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                                        initargs=(self.image_path, self.checker_options))
+
+     # Watch dictionary method
+     async def watch_dictionary(self, interval=2.0):
+          """Reload the word list when it changes on disk, without pausing requests."""
+          loop = asyncio.get_running_loop()
+          while True:
+               await asyncio.sleep(interval)
+               if not self.watcher.changed():
+                    continue
+               try:
+                    # Compile in a thread; requests keep using the old dictionary meanwhile
+                    lexicon = await loop.run_in_executor(None, load_dictionary, self.dictionary)
+                    self.image_path = ensure_image(self.dictionary)
+               except Exception as e:
+                    print(f"[ERROR] Cannot reload the dictionary: {e}", file=sys.stderr)
+                    continue
+               self.checker.set_lexicon(lexicon)
+               if self.checker_options["backend"] == "symspell":
+                    await loop.run_in_executor(None, lambda: self.checker.suggester)
+               # New workers map the new image; the old ones finish what they have and exit
+               old_pool, self.pool = self.pool, self._start_pool()
+               old_pool.shutdown(wait=False)
+               print(f"[STATUS]: Reloaded the dictionary ({len(lexicon)} words)", file=sys.stderr)
+
+     # Check batch method
+     async def _check_batch(self, words):
+          # Cached dictionary and morphology lookups are fast enough for the event loop
+          return {word: self.checker.is_valid(word) for word in words}
+
+     # Suggest batch method
+     async def _suggest_batch(self, words):
+          results = {}
+          missing = []
+          for word in words:
+               suggestions = self.checker.cache.cached_suggestions(word)
+               if suggestions is None:
+                    missing.append(word)
+               else:
+                    results[word] = suggestions
+          if missing:
+               # Results computed against a dictionary that was reloaded meanwhile are not cached
+               generation = self.checker.cache.generation
+               # Spread the uncached words over the pool in one chunk per worker
+               loop = asyncio.get_running_loop()
+               size = -(-len(missing) // max(1, self.workers))
+               chunks = [missing[i:i + size] for i in range(0, len(missing), size)]
+               for computed in await asyncio.gather(*(loop.run_in_executor(self.pool, self.suggest_words, chunk)
+                                                      for chunk in chunks)):
+                    for word, suggestions in computed.items():
+                         self.checker.cache.store_suggestions(word, suggestions, generation)
+                         results[word] = suggestions
+          return results
+
+     # Check endpoint
+     async def check(self, request):
+          suggest = bool(request.get("suggest"))
+          if "text" in request:
+               if not isinstance(request["text"], str):
+                    raise RequestError('"text" must be a string')
+               tokens = list(tokenize(request["text"], normalize=self.checker.cache.normalized))
+               valid = await self.check_batcher.submit({token.normalized for token in tokens})
+               results = [{"line": token.line, "col": token.col, "offset": token.start, "word": token.token,
+                           "valid": valid[token.normalized]} for token in tokens]
+               normalized = [token.normalized for token in tokens]
+          else:
+               words = string_list(request, "words")
+               normalized = [self.checker.cache.normalized(word) for word in words]
+               valid = await self.check_batcher.submit(set(normalized))
+               results = [{"word": word, "valid": valid[clean_word]} for word, clean_word in zip(words, normalized)]
+          for result, clean_word in zip(results, normalized):
+               if result["valid"] and clean_word in self.checker.lexicon.aliases:
+                    # The dictionary's own spelling when the word only matched once folded
+                    canonical = self.checker.layered.canonical(clean_word)
+                    if canonical is not None and canonical != clean_word:
+                         result["canonical"] = canonical
+          if len(self.checker.layered.layers) > 1:
+               # Which word list accepted each valid word; inflected forms are accepted through their root
+               for result, clean_word in zip(results, normalized):
+                    if result["valid"]:
+                         result["layer"] = self.checker.layered.layer(clean_word) or "morphology"
+          if suggest:
+               invalid = {clean_word for result, clean_word in zip(results, normalized) if not result["valid"]}
+               suggestions = await self.suggest_batcher.submit(invalid) if invalid else {}
+               for result, clean_word in zip(results, normalized):
+                    result["suggestions"] = [] if result["valid"] else suggestions[clean_word]
+          return {"results": results}
+
+     # Suggest endpoint
+     async def suggest(self, request):
+          n = request.get("n", self.max_suggestions)
+          if not isinstance(n, int) or isinstance(n, bool) or n < 0:
+               raise RequestError('"n" must be a non-negative integer')
+          n = min(n, self.max_suggestions)
+          words = string_list(request, "words")
+          normalized = {word: self.checker.cache.normalized(word) for word in words}
+          suggestions = await self.suggest_batcher.submit(set(normalized.values()))
+          return {"suggestions": {word: suggestions[clean_word][:n] for word, clean_word in normalized.items()}}
+
+     # Words endpoint
+     async def words(self, request):
+          added, ignored = string_list(request, "add"), string_list(request, "ignore")
+          for word in added:
+               self.checker.add_word(word)
+          for word in ignored:
+               self.checker.ignore_word(word)
+          personal = self.checker.layered.personal
+          return {"added": len(personal.added), "ignored": len(personal.ignored)}
+
+     # Metrics endpoint
+     def metrics(self):
+          return {
+               "endpoints": {path: stats.stats() for path, stats in self.latency.items()},
+               "batching": {"check": self.check_batcher.stats(), "suggest": self.suggest_batcher.stats()},
+               "cache": self.checker.cache.stats(),
+               "workers": self.workers,
+          }
+
+     # Dispatch method
+     async def dispatch(self, method, path, body):
+          """Return (status, payload) for one request."""
+          if method == "GET" and path == "/health":
+               return 200, {"status": "ok", "words": len(self.checker.lexicon)}
+          if method == "GET" and path == "/metrics":
+               return 200, self.metrics()
+          if path not in ("/check", "/suggest", "/words"):
+               return 404, {"error": f"Unknown endpoint '{path}'"}
+          if method != "POST":
+               return 405, {"error": f"{path} expects POST"}
+          try:
+               request = json.loads(body or b"{}")
+          except ValueError as e:
+               return 400, {"error": f"Invalid JSON: {e}"}
+          if not isinstance(request, dict):
+               return 400, {"error": "Expected a JSON object"}
+          try:
+               if path == "/check":
+                    return 200, await self.check(request)
+               if path == "/words":
+                    return 200, await self.words(request)
+               return 200, await self.suggest(request)
+          except RequestError as e:
+               return 400, {"error": str(e)}
+
+     # Handle connection method
+     async def handle(self, reader, writer):
+          """Serve HTTP/1.1 requests on one connection until the client closes it."""
+          try:
+               while True:
+                    request_line = await reader.readline()
+                    if not request_line:
+                         break
+                    try:
+                         method, target, version = request_line.decode("latin-1").split()
+                    except ValueError:
+                         await self.respond(writer, 400, {"error": "Malformed request line"}, False)
+                         break
+                    headers = {}
+                    while True:
+                         line = await reader.readline()
+                         if line in (b"\r\n", b"\n", b""):
+                              break
+                         name, _, value = line.decode("latin-1").partition(":")
+                         headers[name.strip().lower()] = value.strip()
+                    try:
+                         length = content_length(headers)
+                    except RequestError as e:
+                         await self.respond(writer, 400, {"error": str(e)}, False)
+                         break
+                    if length > MAX_BODY:
+                         await self.respond(writer, 413, {"error": "Request body too large"}, False)
+                         break
+                    body = await reader.readexactly(length) if length else b""
+                    keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                    path = target.split("?", 1)[0]
+                    started = time.perf_counter()
+                    try:
+                         status, payload = await self.dispatch(method, path, body)
+                    except Exception as e:
+                         status, payload = 500, {"error": str(e)}
+                    if path in ("/check", "/suggest", "/words", "/metrics", "/health"):
+                         stats = self.latency.setdefault(path, LatencyStats())
+                         stats.record((time.perf_counter() - started) * 1000, status >= 400)
+                    await self.respond(writer, status, payload, keep_alive)
+                    if not keep_alive:
+                         break
+          except (ConnectionError, asyncio.IncompleteReadError):
+               pass
+          finally:
+               writer.close()
+
+     # Respond method
+     async def respond(self, writer, status, payload, keep_alive):
+          reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                     413: "Payload Too Large", 500: "Internal Server Error"}
+          body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+          writer.write(f"HTTP/1.1 {status} {reasons.get(status, 'Error')}\r\n"
+                       f"Content-Type: application/json; charset=utf-8\r\n"
+                       f"Content-Length: {len(body)}\r\n"
+                       f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body)
+          await writer.drain()
+
+     # Serve method
+     async def serve(self, host="127.0.0.1", port=8765):
+          server = await asyncio.start_server(self.handle, host, port)
+          tasks = [asyncio.create_task(self.check_batcher.run()), asyncio.create_task(self.suggest_batcher.run()),
+                      asyncio.create_task(self.watch_dictionary())]
+          print(f"[STATUS]: Spell check service listening on http://{host}:{port}", file=sys.stderr)
+          try:
+               async with server:
+                    await server.serve_forever()
+          finally:
+               for task in tasks:
+                    task.cancel()
+               self.pool.shutdown(cancel_futures=True)
+
+## ============================================================ ## COMMAND LINE ## ============================================================ ##
+# Argument parser method
+def build_parser():
+     parser = argparse.ArgumentParser(description="Serve Tagalog spell checking over a local HTTP/JSON API.")
+     parser.add_argument("--host", default="127.0.0.1", help="address to bind (keep it local)")
+     parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+     parser.add_argument("--dictionary", default=file_path, help="word list to check against")
+     parser.add_argument("--workers", type=int, help="suggestion worker processes (default: one per CPU, 0: a thread)")
+     parser.add_argument("--max-suggestions", type=int, default=5, help="suggestions per invalid word")
+     parser.add_argument("--max-batch", type=int, default=4096, help="words per batched lookup")
+     parser.add_argument("--max-delay-ms", type=float, default=2.0, help="how long a batch waits for more requests")
+     parser.add_argument("--backend", choices=("automaton", "symspell"), default="automaton", help="suggestion backend")
+     parser.add_argument("--prefix-length", type=int, default=10, help="prefix length of the symspell index")
+     parser.add_argument("--no-morphology", action="store_true", help="only accept words listed in the dictionary")
+     parser.add_argument("--layers", help="comma-separated dictionary layers to accept (default: all)")
+     return parser
+
+# Main method
+def main(argv=None):
+     args = build_parser().parse_args(argv)
+     service = SpellCheckService(args.dictionary, args.workers, args.max_suggestions, args.max_batch,
+                                 args.max_delay_ms / 1000, args.backend, args.prefix_length, not args.no_morphology,
+                                 args.layers.split(",") if args.layers else None)
+     try:
+          asyncio.run(service.serve(args.host, args.port))
+     except KeyboardInterrupt:
+          pass
+     return 0
+
+## ============================================================ ## RUN THE SERVER ## ============================================================ ##
+if __name__ == "__main__":
+     sys.exit(main())
@@ -1,7 +1,4 @@
 ## ============================================================ ## MODULES ## ============================================================ ##
-# Regular expression module
-import re
-
 # CustomTkinter module
 import customtkinter as ctk
 from customtkinter import *
@@ -10,32 +7,98 @@ from customtkinter import *
 import tkinter as tk 
 from tkinter.scrolledtext import ScrolledText 
 
-# String matching module
-from difflib import get_close_matches
+# Suggestion engine (Levenshtein automaton over the lexicon)
+from levenshtein import Suggester
 
 # Logging module
 import logging
 
-# os module to ensure that the program can access the filipino_dict.txt file
-import os
+# Array module for the FSM transition table
+from array import array
+
+# Morphological analyzer for affixed and reduplicated forms
+from morphology import MorphologyAnalyzer
+
+# Incremental (dirty-region) re-checking
+from incremental import DirtyRegionTracker
+
+# Batched highlighting of invalid words
+from highlight import HighlightLayer, tag_ranges, word_ranges
+
+# Checked words stored as integer IDs
+from document import DocumentState
+
+# Background worker for validation and suggestions
+from worker import CheckWorker
+
+# LRU cache for normalization, validation and suggestion results
+from cache import WordCache
+
+# FSM trace sinks
+from tracing import NullSink, TRACE_BUFFERED, make_sink
+
+# Per-stage timers, counters and cProfile capture (off unless enabled)
+from profiling import profiler
+
+# Unigram frequencies for ranking suggestions (built offline with frequency.py)
+from frequency import default_table_path, load_frequencies
+
+# Bigram/trigram model for real-word errors such as "ng" for "nang" (built offline with ngram.py)
+from ngram import default_model_path, load_ngram_model
+
+# Personal word list and live reloading of the dictionary
+from lexicon import DictionaryWatcher, LayeredLexicon, PersonalWordList, default_personal_path
+
+# Headless checker module (dictionary loading)
+from checker import file_path, layer_paths, load_dictionary
+
+# Shared tokenizer and cleaning rule
+from tokenizer import normalize_word, tokenize
+
+# Words added to the dictionary or ignored from the GUI, kept in an append-only log next to the word list
+personal_words = PersonalWordList(default_personal_path(file_path))
+
+# Setting word_set as the Filipino word list, memory-mapped from its compiled image, with the personal words layered over it
+# (english_dict.txt and domain_terms.txt next to it are compiled into the same image as extra layers)
+word_set = LayeredLexicon(load_dictionary(file_path), personal_words)
+
+# Suggestion engine over the word list (up to 2 edits, transpositions included)
+suggester = Suggester(word_set.base, max_distance=2, frequencies=load_frequencies(default_table_path(file_path), word_set.base))
+
+# Flags dictionary words that a confusable word fits better in context (None until a model is built)
+context_model = load_ngram_model(default_model_path(file_path), word_set.base)
 
-# Storing the file path of the filipino words list
-file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "filipino_dict.txt")
+# Accepts inflections (kumakain, pinakamaganda, mag-aaral) whose root is in word_set
+analyzer = MorphologyAnalyzer(word_set)
 
-# Loading the file
-def load_filipino_word_list(file_path):
-     try:
-          with open(file_path, "r", encoding="utf-8") as file:
-               return set(file.read().splitlines())
-     except FileNotFoundError:
-          print(f"File '{file_path}' not found. Using an empty word set.")
-          return set()
+# Suggest words method
+def suggest_words(clean_word, n=5):
+     if word_set.selected is None:
+          return [suggestion for suggestion, distance in suggester.suggest(clean_word, n=n)]
+     # The suggester covers every layer; keep the words of the enabled ones
+     return [suggestion for suggestion, distance in suggester.suggest(clean_word, n=2 * n) if suggestion in word_set][:n]
 
-# Setting word_set as the Filipino word list
-word_set = load_filipino_word_list(file_path)
+# Cached normalization, validation and suggestions shared by the FSM, the GUI and the worker thread
+word_cache = WordCache(analyzer, normalize_word, suggest_words)
 
+import os
 import sys
 import atexit
+import threading
+import time
+
+# Swap dictionary method
+def swap_dictionary(base):
+     """Switch every lookup to a reloaded word list.
+
+     The new suggester is built completely before it is published, and the
+     layered lexicon changes its base in one assignment, so a check running on
+     the worker thread sees the old or the new dictionary but never a mix."""
+     global suggester, context_model
+     suggester = Suggester(base, max_distance=2, frequencies=load_frequencies(default_table_path(file_path), base))
+     context_model = load_ngram_model(default_model_path(file_path), base)  # Keyed by word IDs, so it must match
+     word_set.base = base
+     word_cache.invalidate()
 
 ## ============================================================ ## TEXT REDIRECTOR CLASS ## ============================================================ ##
 # Redirects terminal output to the text widget
@@ -45,10 +108,14 @@ class TextRedirector:
           self.tag = tag
 
      def write(self, text):
+          if profiler.enabled:
+               started = time.perf_counter_ns()
           self.text_widget.configure(state="normal")  # Enable editing
           self.text_widget.insert(tk.END, text, (self.tag,))
           self.text_widget.configure(state="disabled")  # Disable editing to mimic a terminal
           self.text_widget.see(tk.END)  # Scroll to the end
+          if profiler.enabled:
+               profiler.record("terminal", started)
 
      def flush(self):
           pass  # No need for explicit flushing
@@ -59,82 +126,97 @@ def reset_output():
      sys.stdout = sys.__stdout__
      sys.stderr = sys.__stderr__
 
-## ============================================================ ## FSM STATE BASE CLASS ## ============================================================ ##
-class State:
-     # Constructor
-     def __init__(self, fsm):
-          self.fsm = fsm
-
-     # Execute method
-     def execute(self, word):
-          pass
-
 ## ============================================================ ## FSM STATES ## ============================================================ ##
-class StartState(State):
-     # Execute method
-     def execute(self, word):
-          print("\n[TRANSITION]: Start -> Validating")
-          clean_word = re.sub(r"[^\w’'-]", "", word.lower()) # Added hyphen to allow hyphenated words
-
-          if clean_word in word_set:
-               print("[TRANSITION]: Validating -> Valid")
-               try:
-                    # Add preconditions or additional checks here
-                    if self.can_transition_to_valid(clean_word):
-                         self.fsm.transition("valid", word)  # Pass the word to transition
-                    else:
-                         print("Preconditions not met for transition to 'valid'")
-               except Exception as e:
-                    logging.error(f"Error during transition to 'valid': {e}")
-          else:
-               print("[TRANSITION]: Validating -> Invalid")
-               self.fsm.transition("invalid", word)  # Pass the word to transition
-
-     # Additional checks method
-     def can_transition_to_valid(self, word):
-          return True
-     
-class ValidWordState(State):
-     def execute(self, word):
-          # Placeholder for valid word processing
-          pass
-
-class InvalidWordState(State):
-     def execute(self, word):
-          # Placeholder for invalid word processing
-          pass
+# Integer state IDs; VALID and INVALID are final
+START, VALIDATING, ANALYZING, VALID, INVALID = range(5)
+STATE_NAMES = ("Start", "Validating", "Analyzing", "Valid", "Invalid")
+
+# Input symbols: what the lookups found out about a word
+LISTED, ANALYSED, UNKNOWN = range(3)
+SYMBOL_COUNT = 3
+
+# Transition table: TRANSITIONS[state * SYMBOL_COUNT + symbol] is the next state
+TRANSITIONS = array("B", [
+     # LISTED      ANALYSED     UNKNOWN
+     VALIDATING,  VALIDATING,  VALIDATING,  # Start
+     VALID,       ANALYZING,   ANALYZING,   # Validating: listed words are accepted, the rest go to the analyzer
+     VALID,       VALID,       INVALID,     # Analyzing: accepted if a listed root was found
+     VALID,       VALID,       VALID,       # Valid (final)
+     INVALID,     INVALID,     INVALID,     # Invalid (final)
+])
+
+# Compile method
+def compile_outcomes(transitions):
+     """Return the final state the machine reaches from START for every input symbol."""
+     outcomes = array("B")
+     for symbol in range(SYMBOL_COUNT):
+          state = START
+          while state < VALID:
+               state = transitions[state * SYMBOL_COUNT + symbol]
+          outcomes.append(state)
+     return outcomes
+
+# Final state per input symbol, so the batch path does one lookup per word
+OUTCOMES = compile_outcomes(TRANSITIONS)
 
 ## ============================================================ ## FSM CLASS ## ============================================================ ##
+# Table-driven spell-checking machine
+#
+# Without tracing a word costs one cached validity lookup and one array index:
+# listed and analysed words both end in VALID, so the cached answer is enough
+# to pick the outcome. With tracing on, every word walks the table state by
+# state so each transition can be reported.
 class FSM:
+     __slots__ = ("tracer", "text_widget")
+
      # Constructor
-     def __init__(self):
-          # Initialize states
-          self.states = {
-               "start": StartState(self),
-               "valid": ValidWordState(self),
-               "invalid": InvalidWordState(self)
-          }
-          # Set the initial state
-          self.current_state = self.states["start"]
-          self.text_widget = None 
-
-     # Transition method
-     def transition(self, state_name, word=None):
-          if state_name in self.states:
-               # Print the resulting state and word
-               if state_name != "start" and word:
-                    print(f"[RESULTING STATE]: {state_name.capitalize()}", flush=True)
-                    print(f"[WORD]: {word}", flush=True)
-               self.current_state = self.states[state_name]
-          else:
-               # Print error message if state does not exist
-               print(f"Error: State '{state_name}' does not exist", flush=True)
-     
+     def __init__(self, tracer=None):
+          # Trace sink for transitions (off unless one is given, see tracing.py)
+          self.tracer = tracer if tracer is not None else NullSink()
+          self.text_widget = None
+
+     # Classify method
+     def classify(self, word):
+          """Return the input symbol for a word: listed, analysable into a listed root, or unknown."""
+          if word_cache.normalized(word) in word_set:
+               return LISTED
+          return ANALYSED if word_cache.is_valid(word) else UNKNOWN
+
      # Execute method
      def execute(self, word):
-          self.current_state.execute(word)
-          self.transition("start")  # Always reset to StartState after processing a word
-     
+          """Run one word through the machine and return its final state."""
+          return self.execute_batch((word,))[0]
+
+     # Execute batch method
+     def execute_batch(self, words):
+          """Run every word through the machine and return their final states as an array of state IDs."""
+          if self.tracer.enabled:
+               return array("B", [self._walk(word) for word in words])
+          is_valid = word_cache.is_valid
+          accept, reject = OUTCOMES[LISTED], OUTCOMES[UNKNOWN]
+          return array("B", [accept if is_valid(word) else reject for word in words])
+
+     # Walk method
+     def _walk(self, word):
+          """Run one word through the table a transition at a time, tracing each one."""
+          tracer = self.tracer
+          symbol = self.classify(word)
+          state = START
+          while state < VALID:
+               target = TRANSITIONS[state * SYMBOL_COUNT + symbol]
+               if state == ANALYZING and target == VALID:
+                    clean_word = word_cache.normalized(word)
+                    tracer.emit("analysis", word=clean_word, analysis=str(analyzer.analyze(clean_word)))
+               tracer.emit("transition", source=STATE_NAMES[state], target=STATE_NAMES[target])
+               state = target
+          tracer.emit("result", state=STATE_NAMES[state], word=word)
+          return state
+
+     # Set tracer method
+     def set_tracer(self, tracer):
+          self.tracer.close()
+          self.tracer = tracer
+
      # Set text widget method
      def set_text_widget(self, text_widget):
           self.text_widget = text_widget
@@ -142,20 +224,9 @@ class FSM:
      # Highlight word method
      def highlight_word(self, word):
           if self.text_widget:
-               # Get the current content of the text widget
-               content = self.text_widget.get("1.0", tk.END)
-               start_index = "1.0"
-               word_length = len(word)
-               # Find and highlight the word in the text widget
-               while True:
-                    start_index = self.text_widget.search(word, start_index, stop_index=tk.END, regexp=False)
-                    if not start_index:
-                         break
-                    end_index = f"{start_index} + {word_length}c"
-                    tag_name = f"invalid_{start_index.replace('.', '_')}"
-                    self.text_widget.tag_add(tag_name, start_index, end_index)
-                    self.text_widget.tag_config(tag_name, foreground="red")
-                    start_index = end_index
+               # Find every occurrence in one read of the text and tag them all with one command
+               content = self.text_widget.get("1.0", "end-1c")
+               tag_ranges(self.text_widget, "add", "invalid", word_ranges(content, word))
           else:
                print("Error: Text widget is not set", flush=True)
 
@@ -237,10 +308,27 @@ class SpellChecker:
           self.clear_button = ctk.CTkButton(master=self.right_frame, width=100, height=40, text="Clear Suggestions", font=("Arial", 10, "bold"), fg_color="red", hover_color="green", command=self.delete_suggestions)
           self.clear_button.grid(row=1, column=0, sticky="sw", padx=10, pady=(10, 10))
 
+          # Add to Dictionary and Ignore Buttons (act on the last clicked word)
+          self.add_button = ctk.CTkButton(master=self.right_frame, width=100, height=40, text="Add to Dictionary", font=("Arial", 10, "bold"), command=self.add_to_dictionary)
+          self.add_button.grid(row=2, column=0, sticky="sw", padx=10, pady=(0, 10))
+          self.ignore_button = ctk.CTkButton(master=self.right_frame, width=100, height=40, text="Ignore", font=("Arial", 10, "bold"), command=self.ignore_word)
+          self.ignore_button.grid(row=2, column=0, sticky="se", padx=10, pady=(0, 10))
+
           # Toggle Switch for Dark Mode and Light Mode
           self.toggle_switch = ctk.CTkSwitch(master=self.right_frame, width=100, height=40, text="Dark Mode", font=("Arial", 10, "bold"), onvalue=1, offvalue=0, command=self.toggle_dark_mode)
           self.toggle_switch.grid(row=1, column=0, sticky="se", padx=10, pady=(10, 10))
 
+          # Dictionary Layer Check Boxes (only when word lists other than Tagalog were found)
+          self.layer_frame = ctk.CTkFrame(master=self.right_frame, fg_color="transparent")
+          self.layer_boxes = {}
+          if len(word_set.layers) > 1:
+               self.layer_frame.grid(row=3, column=0, sticky="sw", padx=10, pady=(0, 10))
+               for name in word_set.layers:
+                    box = ctk.CTkCheckBox(master=self.layer_frame, text=name.capitalize(), font=("Arial", 10, "bold"), command=self.layers_changed)
+                    box.select()
+                    box.pack(side="left", padx=(0, 10))
+                    self.layer_boxes[name] = box
+
           # Terminal Output Frame
           self.terminal_frame = ctk.CTkFrame(master=self.bottom_frame, width=900, height=250)
           self.terminal_frame.pack(side="bottom", fill="both", expand=True, padx=10, pady=10)
@@ -259,8 +347,29 @@ class SpellChecker:
           self.terminal_output.tag_config("stdout", foreground="white")
           self.terminal_output.tag_config("stderr", foreground="red")
 
+          # FSM trace level from FSM_TRACE: "buffered" (default) batches the trace into the
+          # terminal pane every 100 ms, "structured" writes JSON lines to FSM_TRACE_FILE, "off" skips it
+          self.fsm.set_tracer(make_sink(os.environ.get("FSM_TRACE", TRACE_BUFFERED),
+                                        write=sys.stdout.write, schedule=self.root.after,
+                                        path=os.environ.get("FSM_TRACE_FILE", "fsm_trace.jsonl")))
+
+          # Profiling: FSM_PROFILE=1 starts the stage timers; F9 toggles them, F10 dumps them to this
+          # pane (and FSM_PROFILE_FILE, if set) and F11 starts or stops a cProfile capture
+          profiler.enable(os.environ.get("FSM_PROFILE", "0") not in ("", "0"))
+          self.profile_path = os.environ.get("FSM_PROFILE_FILE")
+          self.root.bind("<F9>", self.toggle_profiling)
+          self.root.bind("<F10>", self.dump_profile)
+          self.root.bind("<F11>", self.toggle_capture)
+
+          # Invalid words are tagged "invalid" in batches; the tag style is configured once here
+          self.highlights = HighlightLayer(self.input_text, "invalid", foreground="red")
+
+          # Dictionary words that another word fits better in context are underlined in a second layer
+          self.context_highlights = HighlightLayer(self.input_text, "context", foreground="dark orange", underline=True)
+
           # Bind the click event to invalid words only
           self.input_text.tag_bind("invalid", "<Button-1>", self.handle_click)
+          self.input_text.tag_bind("context", "<Button-1>", self.handle_context_click)
           
           # Bind text widget to manual or automatic check
           if user_input == "1":
@@ -276,18 +385,30 @@ class SpellChecker:
           # Set widgets for FSM
           self.fsm.set_text_widget(self.input_text)
           self.old_spaces = 0
-          self.processed_words = set()  # Track already processed words
+          self.document = DocumentState(word_set.base)  # Words of the checked text as IDs, for clicks and memory
+          self.tracker = DirtyRegionTracker(word_cache.normalized)  # Lines checked so far, for incremental re-checking
+          self.monitoring = False
+
+          # Validation and suggestions run on a worker thread; results are applied from poll_results
+          self.worker = CheckWorker(self.tracker, self.is_valid, self.get_suggestions, context=self.check_context)
+          self.input_text.after(20, self.poll_results)
+
+          # Personal words and live reloading of filipino_dict.txt
+          self.selected_word = None  # Last invalid word clicked, for Add to Dictionary / Ignore
+          self.watcher = DictionaryWatcher(*[path for name, path in layer_paths(file_path)])
+          self.reloaded = None  # Set by the reload thread, applied by poll_dictionary
+          self.reloading = False  # A reload thread is compiling the word list
+          self.reload_pending = False  # The files changed again since that reload started
+          self.input_text.after(2000, self.poll_dictionary)
           self.root.mainloop()
+          self.worker.stop()
 
      # Highlight word method
      def highlight_word(self, word, start_pos, end_pos, is_invalid):
-          # Highlight a word as valid or invalid.
-          self.input_text.tag_remove("invalid", start_pos, end_pos)  # Remove previous invalid tags
-          self.input_text.tag_remove("valid", start_pos, end_pos)    # Remove previous valid tags
-
+          # Highlight a single word as valid or invalid (the "invalid" tag style is set once in the constructor)
+          self.input_text.tag_remove("invalid", start_pos, end_pos)
           if is_invalid:
                self.input_text.tag_add("invalid", start_pos, end_pos)
-               self.input_text.tag_config("invalid", foreground="red")
      
      # Handle click method
      def handle_click(self, event):
@@ -301,31 +422,143 @@ class SpellChecker:
 
                # Check if the "invalid" tag is present
                if "invalid" in tags:
-                    # Get the word at the clicked position
-                    word_start = self.input_text.index(f"{click_index} wordstart")
-                    word_end = self.input_text.index(f"{click_index} wordend")
-                    clicked_word = self.input_text.get(word_start, word_end).strip()
-
-                    # Display suggestions in the suggestion box
-                    suggestions = self.get_suggestions(clicked_word)
-                    self.delete_suggestions()
-                    self.suggestions_text.configure(state="normal")
-
-                    if suggestions:
-                         self.suggestions_text.insert(tk.END, f"Suggestions for '{clicked_word}':\n")
-                         for suggestion in suggestions:
-                              self.suggestions_text.insert(tk.END, f"• {suggestion}\n")
+                    # Get the word at the clicked position from the checked document (hyphens and
+                    # apostrophes included), or ask Tk for it when typing manually
+                    line, col = map(int, click_index.split("."))
+                    token = self.document.token_at(line, col)
+                    if token is not None:
+                         clicked_word = self.document.text(line, token[0], token[1])
                     else:
-                         self.suggestions_text.insert(tk.END, f"No suggestions for '{clicked_word}'.\n")
-                    
-                    self.suggestions_text.configure(state="disabled")
+                         word_start = self.input_text.index(f"{click_index} wordstart")
+                         word_end = self.input_text.index(f"{click_index} wordend")
+                         clicked_word = self.input_text.get(word_start, word_end).strip()
+
+                    # Look the suggestions up in the background; show_suggestions displays them
+                    self.selected_word = clicked_word
+                    self.worker.submit("suggest", clicked_word)
           except Exception as e:
                print(f"Error in handle_click: {e}")
 
+     # Handle context click method
+     def handle_context_click(self, event):
+          """Show the word that fits the context better for a clicked real-word error."""
+          try:
+               click_index = self.input_text.index(f"@{event.x},{event.y}")
+               line, col = map(int, click_index.split("."))
+
+               # Sentences end at line breaks, so the clicked line is all the context the worker used
+               content = self.input_text.get(f"{line}.0", f"{line}.end")
+               tokens = list(tokenize(content, line, normalize=word_cache.normalized))
+               for index, replacement in self.check_context(tokens).items():
+                    token = tokens[index]
+                    if token.col <= col < token.col + len(token.token):
+                         self.selected_word = None  # Already in the dictionary
+                         self.show_suggestions(token.token, [replacement])
+                         return
+          except Exception as e:
+               print(f"Error in handle_context_click: {e}")
+
+     # Show suggestions method
+     def show_suggestions(self, clicked_word, suggestions):
+          """Display suggestions in the suggestion box."""
+          self.delete_suggestions()
+          self.suggestions_text.configure(state="normal")
+
+          if suggestions:
+               self.suggestions_text.insert(tk.END, f"Suggestions for '{clicked_word}':\n")
+               for suggestion in suggestions:
+                    self.suggestions_text.insert(tk.END, f"• {suggestion}\n")
+          else:
+               self.suggestions_text.insert(tk.END, f"No suggestions for '{clicked_word}'.\n")
+
+          self.suggestions_text.configure(state="disabled")
+
+     # Is valid method
+     def is_valid(self, word):
+          """Return True if the word is in the dictionary (safe to call from the worker thread)."""
+          return word_cache.is_valid(word)
+
      # Get suggestions method
      def get_suggestions(self, word):
           """Retrieve suggestions for the given word."""
-          return get_close_matches(word, word_set, n=5, cutoff=0.6)
+          return word_cache.suggestions(word)
+
+     # Check context method
+     def check_context(self, tokens):
+          """Return {index: replacement} for the tokens that a confusable word fits better (safe to call from the worker thread)."""
+          model = context_model  # Read once: a dictionary reload may replace it meanwhile
+          if model is None:
+               return {}
+          hints = model.check_tokens(tokens)
+          # A word outside the enabled dictionary layers is already highlighted as misspelled
+          return {index: word for index, word in hints.items() if word_cache.is_valid(tokens[index].token)}
+
+     # Add to dictionary method
+     def add_to_dictionary(self):
+          """Accept the last clicked word from now on and record it in the personal word list."""
+          if self.selected_word:
+               personal_words.add(word_cache.normalized(self.selected_word))
+               print(f"\n[STATUS]: Added '{self.selected_word}' to the personal dictionary")
+               self.personal_words_changed()
+
+     # Ignore word method
+     def ignore_word(self):
+          """Stop flagging the last clicked word and record it in the personal word list."""
+          if self.selected_word:
+               personal_words.ignore(word_cache.normalized(self.selected_word))
+               print(f"\n[STATUS]: Ignoring '{self.selected_word}'")
+               self.personal_words_changed()
+
+     # Personal words changed method
+     def personal_words_changed(self):
+          word_cache.invalidate()  # An added word may also be the root of inflected forms
+          self.selected_word = None
+          self.delete_suggestions()
+          self.recheck_all()
+
+     # Layers changed method
+     def layers_changed(self):
+          """Accept words from the checked dictionary layers only, and check the document again."""
+          names = [name for name, box in self.layer_boxes.items() if box.get()]
+          word_set.set_layers(names)
+          word_cache.invalidate()
+          print(f"\n[STATUS]: Dictionary layers: {', '.join(names) or 'none'}")
+          self.recheck_all()
+
+     # Recheck all method
+     def recheck_all(self):
+          """Check the whole document again in the background (after the accepted words changed)."""
+          self.worker.reset()
+          self.worker.submit("check", self.input_text.get("1.0", "end-1c"))
+
+     # Poll dictionary method
+     def poll_dictionary(self):
+          """Reload filipino_dict.txt in the background when it changes on disk."""
+          # One reload at a time: changes seen while one runs are merged into a single follow-up reload,
+          # so two quick saves never race to publish (or write) their dictionaries
+          if self.watcher.changed():
+               self.reload_pending = True
+          if self.reload_pending and not self.reloading:
+               self.reload_pending = False
+               self.reloading = True
+               threading.Thread(target=self.reload_dictionary, name="DictionaryReload", daemon=True).start()
+          if self.reloaded is not None:
+               base, self.reloaded = self.reloaded, None
+               swap_dictionary(base)
+               self.document.reset(base)  # Word IDs belong to the old word list
+               print(f"\n[STATUS]: Reloaded the dictionary ({len(base)} words)")
+               self.recheck_all()
+          self.input_text.after(2000, self.poll_dictionary)
+
+     # Reload dictionary method
+     def reload_dictionary(self):
+          """Compile the changed word list off the Tk thread; checks keep using the old one meanwhile."""
+          try:
+               self.reloaded = load_dictionary(file_path)
+          except Exception as e:
+               logging.error(f"Error reloading the dictionary: {e}")
+          finally:
+               self.reloading = False
 
      # Delete suggestions method
      def delete_suggestions(self):
@@ -334,6 +567,26 @@ class SpellChecker:
           self.suggestions_text.delete("1.0", tk.END)
           self.suggestions_text.configure(state="disabled")
 
+     # Toggle profiling method
+     def toggle_profiling(self, event=None):
+          profiler.enable(not profiler.enabled)
+          print(f"\n[STATUS]: Profiling {'on' if profiler.enabled else 'off'}")
+
+     # Dump profile method
+     def dump_profile(self, event=None):
+          """Print the stage timers and counters, and append them to FSM_PROFILE_FILE if it is set."""
+          print()
+          profiler.dump(sys.stdout.write, self.profile_path)
+
+     # Toggle capture method
+     def toggle_capture(self, event=None):
+          """Start a cProfile capture of the Tk thread, or stop it and print the top functions."""
+          report = profiler.toggle_capture("fsm_profile.prof")
+          if report is None:
+               print("\n[STATUS]: cProfile capture started (F11 again to stop)")
+          else:
+               print(f"\n[STATUS]: cProfile capture saved to 'fsm_profile.prof'\n{report}")
+
      # Toggle dark mode method
      def toggle_dark_mode(self):
           val = self.toggle_switch.get()
@@ -362,7 +615,12 @@ class SpellChecker:
                self.terminal_label._set_appearance_mode("dark")
 
                self.clear_button._set_appearance_mode("dark")
+               self.add_button._set_appearance_mode("dark")
+               self.ignore_button._set_appearance_mode("dark")
                self.toggle_switch._set_appearance_mode("dark")
+               self.layer_frame._set_appearance_mode("dark")
+               for box in self.layer_boxes.values():
+                    box._set_appearance_mode("dark")
           else:
                # Set light mode
                self.root._set_appearance_mode("light")
@@ -388,113 +646,110 @@ class SpellChecker:
                self.terminal_label._set_appearance_mode("light")
 
                self.clear_button._set_appearance_mode("light")
+               self.add_button._set_appearance_mode("light")
+               self.ignore_button._set_appearance_mode("light")
                self.toggle_switch._set_appearance_mode("light")
+               self.layer_frame._set_appearance_mode("light")
+               for box in self.layer_boxes.values():
+                    box._set_appearance_mode("light")
 
      # Manual check method
      def manual_check(self, event):
           """Manually check the validity of words and show suggestions for invalid words."""
-          # Get the current content of the text widget
-          content = self.input_text.get("1.0", tk.END).strip()
-
           # Trigger on space or Enter key
           if event.keysym in ("space", "Return"):
-               words = content.split()
-
-               # Extract the last word, clean it, and process
-               if words and len(words[-1]) > 1:  # Only process words longer than one character
-                    last_word = words[-1]
-                    clean_word = re.sub(r"[^\w’'-]", "", last_word.lower()) # Allow ’, ', and hyphens
-
-                    # Find the start and end positions of the word
-                    start_pos = content.rfind(last_word)
-                    end_pos = start_pos + len(last_word)
-
-                    # Calculate line and column positions for multi-line text
-                    line_start = content[:start_pos].count('\n') + 1
-                    col_start = start_pos - content.rfind('\n', 0, start_pos) - 1
-                    line_end = content[:end_pos].count('\n') + 1
-                    col_end = end_pos - content.rfind('\n', 0, end_pos) - 1
-                    
+               # Text of the current line up to the space or newline that was just typed
+               typed_index = self.input_text.index("insert -1c")
+               line = int(typed_index.split(".")[0])
+               content = self.input_text.get(f"{typed_index} linestart", typed_index)
+               tokens = list(tokenize(content, line, normalize=word_cache.normalized))
+
+               # Extract the last word and process it
+               if tokens and len(tokens[-1].token) > 1:  # Only process words longer than one character
+                    last_token = tokens[-1]
+
                     # Highlight invalid words in red and valid words in black
-                    self.highlight_word(last_word, f"{line_start}.{col_start}", f"{line_end}.{col_end}", clean_word not in word_set)
+                    self.highlight_word(last_token.token, last_token.start_index, last_token.end_index, not word_cache.is_valid(last_token.token))
 
                     # Execute FSM for the word
-                    self.fsm.execute(last_word)
-                    self.processed_words.add(last_word)
+                    self.fsm.execute(last_token.token)
      
      # Automatic check method
      def automatic_check(self, event):
-          # Get the current content of the text widget
-          content = self.input_text.get("1.0", tk.END).strip()
-
-          # Detect paste: Check if multiple spaces are added at once
-          if event.keysym == "Control_L" or len(content.split()) > len(self.processed_words):
-               self.processed_words.clear()  # Clear previously processed words
-               self.invalid_words = []  # Add a list to store and track invalid words
-
-               # Process each word in the pasted text
-               for word in content.split():
-                    clean_word = re.sub(r"[^\w'’\-]", "", word.lower())  # Allow hyphens
-                    start_pos = content.find(word)
-                    end_pos = start_pos + len(word)
-
-                    # Calculate line and column positions for multi-line text
-                    line_start = content[:start_pos].count('\n') + 1
-                    col_start = start_pos - content.rfind('\n', 0, start_pos) - 1
-                    line_end = content[:end_pos].count('\n') + 1
-                    col_end = end_pos - content.rfind('\n', 0, end_pos) - 1
-
-                    # Highlight invalid words
-                    self.highlight_word(word, f"{line_start}.{col_start}", f"{line_end}.{col_end}", clean_word not in word_set)
-
-                    # Run FSM for the current word
-                    self.fsm.execute(word)
-
-               # Save the initial state of words in the pasted text
-               self.processed_words = set(content.split())
+          """Check the edited region right away and keep monitoring further edits."""
+          self.check_dirty_region()
+
+          # Start the monitoring loop only once, however many pastes follow
+          if not self.monitoring:
+               self.monitoring = True
+               self.input_text.after(100, self.monitor_edits)
+
+     # Check dirty region method
+     def check_dirty_region(self):
+          """Send the text to the worker if it changed since the last pass."""
+          # Tk sets the modified flag on every insert/delete; nothing to do if it is clear
+          if not self.input_text.edit_modified():
+               return
+          self.input_text.edit_modified(False)
+
+          # Submitting cancels any check still running for an older snapshot
+          self.worker.submit("check", self.input_text.get("1.0", "end-1c"))
+
+     # Poll results method
+     def poll_results(self):
+          """Apply finished background results on the Tk thread."""
+          # Large documents are checked around the visible lines first
+          self.worker.set_viewport(*self.visible_lines())
+          for kind, result in self.worker.poll():
+               if kind == "check":
+                    self.apply_region(*result)
+               else:
+                    self.show_suggestions(*result)
+          self.input_text.after(20, self.poll_results)
+
+     # Visible lines method
+     def visible_lines(self):
+          """Return the first and last line shown in the input box."""
+          first = self.input_text.index("@0,0")
+          last = self.input_text.index(f"@0,{self.input_text.winfo_height()}")
+          return int(first.split(".")[0]), int(last.split(".")[0])
+
+     # Apply region method
+     def apply_region(self, region, flags, done=True, hints=()):
+          """Highlight the words of a checked region (or of one part of it)."""
+          # The text changed after this snapshot was taken, so its positions may be off;
+          # drop it and check the newer text (which still covers this region)
+          if self.input_text.edit_modified():
+               self.check_dirty_region()
+               return
 
-               # Start monitoring for edits
-               self.monitor_edits()
+          # Re-highlight the changed lines in a few batched commands, then run the FSM over the words
+          if profiler.enabled:
+               started = time.perf_counter_ns()
+          self.highlights.apply(region, flags)
+          if hints or context_model is not None:
+               self.context_highlights.apply(region, [index not in hints for index in range(len(flags))])
+          if profiler.enabled:
+               profiler.record("highlight", started)
+               started = time.perf_counter_ns()
+          self.document.apply(region)
+          if profiler.enabled:
+               profiler.record("document", started)
+               started = time.perf_counter_ns()
+          self.fsm.execute_batch([token.token for token in region.words])
+          if profiler.enabled:
+               profiler.record("fsm", started)
+
+          # Record the region once its last part is in, so an interrupted check is redone
+          if done:
+               self.worker.commit(region)
 
      def monitor_edits(self):
           """Monitor edits in the text widget and run FSM for edited words."""
-          # Get the current content of the text widget
-          current_content = self.input_text.get("1.0", tk.END).strip()
-          current_words = {}
-               
-          # Build a dictionary of words with their positions
-          for match in re.finditer(r"(?:^|(?<=\s))['’\-]*[\w]+(?:['’\-]+[\w]+)*['’\-]*(?=$|\s)", current_content):
-               word = match.group()
-               start_pos = match.start()
-               current_words[start_pos] = word
-
-          # Compare current words with previously processed words
-          edited_words = {
-               pos: word for pos, word in current_words.items()
-               if pos not in self.processed_words or self.processed_words.get(pos) != word
-          }
-
-          # Process only the edited words
-          if edited_words:
-               for start_pos, word in edited_words.items():
-                    clean_word = re.sub(r"[^\w'’\-]", "", word.lower())  # Allow hyphens and apostrophes
-                    end_pos = start_pos + len(word)
-
-                    # Calculate line and column positions
-                    line_start = current_content[:start_pos].count('\n') + 1
-                    col_start = start_pos - current_content.rfind('\n', 0, start_pos) - 1
-                    line_end = current_content[:end_pos].count('\n') + 1
-                    col_end = end_pos - current_content.rfind('\n', 0, end_pos) - 1
-
-                    # Highlight the word and execute FSM
-                    self.highlight_word(word, f"{line_start}.{col_start}", f"{line_end}.{col_end}", clean_word not in word_set)
-                    self.fsm.execute(word)
-
-          # Update processed words with current positions and content
-          self.processed_words = current_words
+          self.check_dirty_region()
 
           # Continue monitoring after a short delay
-          self.input_text.after(100, self.monitor_edits)     
+          self.input_text.after(100, self.monitor_edits)
 
 ## ============================================================ ## RUN THE APPLICATION ## ============================================================ ##
 if __name__ == "__main__":
@@ -0,0 +1,174 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Array and search modules for the compact index
+from array import array
+from bisect import bisect_left
+
+# Modules for the on-disk index
+import struct
+import zlib
+
+# Shared memory-mapped image format
+from image import check_lexicon, lexicon_digest, map_image, write_image
+
+# Distance verification reuses the Levenshtein automaton
+from levenshtein import LevenshteinAutomaton, fold_map, rank_candidates
+
+# On-disk index layout: [keys][word IDs][trailer]
+# The trailer ends with the version and magic, like every image (see image.py).
+INDEX_MAGIC = b"FSMSYMS\0"
+INDEX_VERSION = 2
+INDEX_TRAILER = struct.Struct("<IIII32sI8s")  # entries, max distance, prefix length, lexicon words, lexicon SHA-256, version, magic
+
+# Delete variants method
+def delete_variants(word, max_distance):
+     """Return word and every string obtained by deleting up to max_distance of its characters."""
+     variants = {word}
+     frontier = [word]
+     for _ in range(max_distance):
+          next_frontier = []
+          for stem in frontier:
+               for i in range(len(stem)):
+                    variant = stem[:i] + stem[i + 1:]
+                    if variant not in variants:
+                         variants.add(variant)
+                         next_frontier.append(variant)
+          frontier = next_frontier
+     return variants
+
+# Key method
+def delete_key(variant):
+     """32-bit hash of a delete variant (collisions only cost an extra distance check)."""
+     return zlib.crc32(variant.encode("utf-8"))
+
+## ============================================================ ## SYMSPELL INDEX CLASS ## ============================================================ ##
+# Symmetric-delete suggestion backend (SymSpell) over a DAWG lexicon
+#
+# Every word's first prefix_length characters are expanded into their delete
+# variants (up to max_distance deletions). Each variant is stored as a hashed
+# key next to the word's ID from the lexicon's perfect hash:
+#   keys[i]  -> delete_key() of a variant, sorted
+#   ids[i]   -> ID of a word that produces that variant
+# A query expands its own prefix the same way; the words that share a variant
+# with it are the only candidates, and each is verified with the Levenshtein
+# automaton before it is returned.
+#
+# Queries are folded keys, so words are folded with the same map as the
+# Suggester (fold_map) before they are expanded and verified: "binan" shares
+# its variants with biñan, and both backends agree on every distance.
+#
+# prefix_length is the memory/latency knob: a shorter prefix produces fewer
+# variants per word (a smaller index) but more candidates to verify per query.
+class SymSpellIndex:
+     # Constructor
+     def __init__(self, lexicon, keys, ids, max_distance=2, prefix_length=7, transpositions=True):
+          self.lexicon = lexicon
+          self.frequencies = None  # Optional FrequencyTable for noisy-channel ranking
+          self.keys = keys
+          self.ids = ids
+          self.max_distance = max_distance
+          self.prefix_length = prefix_length
+          self.transpositions = transpositions
+          self.folded = fold_map(lexicon.alphabet)
+
+     # Build method
+     @classmethod
+     def build(cls, lexicon, max_distance=2, prefix_length=7, transpositions=True):
+          """Expand every word of lexicon into its delete variants and sort them into a compact index."""
+          entries = []
+          seen = {}
+          table = str.maketrans(fold_map(lexicon.alphabet))
+          for word_id, word in enumerate(lexicon):
+               prefix = word[:prefix_length].translate(table)
+               variants = seen.get(prefix)
+               if variants is None:
+                    # Words sharing a prefix share its variants
+                    variants = seen[prefix] = [delete_key(variant) << 32 for variant in delete_variants(prefix, max_distance)]
+               entries.extend(key | word_id for key in variants)
+          entries.sort()
+          keys = array("I", (entry >> 32 for entry in entries))
+          ids = array("I", (entry & 0xFFFFFFFF for entry in entries))
+          return cls(lexicon, keys, ids, max_distance, prefix_length, transpositions)
+
+     # Search method
+     def _search(self, word, max_distance=None):
+          """Return every (candidate, distance, word ID) triple in the lexicon within max_distance edits."""
+          if max_distance is None or max_distance > self.max_distance:
+               max_distance = self.max_distance
+          keys = self.keys
+          ids = self.ids
+          word_ids = set()
+          for variant in delete_variants(word[:self.prefix_length], max_distance):
+               key = delete_key(variant)
+               i = bisect_left(keys, key)
+               while i < len(keys) and keys[i] == key:
+                    word_ids.add(ids[i])
+                    i += 1
+
+          automaton = LevenshteinAutomaton(word, max_distance, self.transpositions)
+          folded = self.folded
+          found = []
+          for word_id in word_ids:
+               candidate = self.lexicon.word_at(word_id)
+               if abs(len(candidate) - len(word)) > max_distance:
+                    continue
+               state = automaton.start()
+               for char in candidate:
+                    state = automaton.step(state, folded.get(char, char))
+                    if not automaton.can_match(state):
+                         break
+               else:
+                    if automaton.is_match(state):
+                         found.append((candidate, automaton.distance(state), word_id))
+          return found
+
+     # Candidates method
+     def candidates(self, word, max_distance=None):
+          """Return every (candidate, distance) pair in the lexicon within max_distance edits."""
+          return [(candidate, distance) for candidate, distance, word_id in self._search(word, max_distance)]
+
+     # Suggest method
+     def suggest(self, word, n=5, max_distance=None):
+          """Return up to n ranked (suggestion, distance) pairs for word (same ranking as Suggester)."""
+          return rank_candidates(word, self._search(word, max_distance), n, self.frequencies)
+
+     # Memory usage method
+     def nbytes(self):
+          return len(self.keys) * self.keys.itemsize + len(self.ids) * self.ids.itemsize
+
+     # Save method
+     def save(self, path):
+          """Write the index next to its lexicon so later starts can memory-map it."""
+          write_image(path, (array("I", self.keys).tobytes(), array("I", self.ids).tobytes()),
+                      INDEX_TRAILER.pack(len(self.keys), self.max_distance, self.prefix_length,
+                                         len(self.lexicon), lexicon_digest(self.lexicon), INDEX_VERSION, INDEX_MAGIC))
+
+     # Open method
+     @classmethod
+     def open(cls, path, lexicon, transpositions=True):
+          """Memory-map an index written by save() for the same lexicon."""
+          image, (entries, max_distance, prefix_length, word_count, digest, version, magic) = \
+               map_image(path, INDEX_MAGIC, INDEX_VERSION, INDEX_TRAILER, "SymSpell index")
+          # Word IDs are only meaningful for the word list the index was built from
+          check_lexicon(path, lexicon, word_count, digest)
+
+          view = memoryview(image)
+          keys = view[:entries * 4].cast("I")
+          ids = view[entries * 4:entries * 8].cast("I")
+          return cls(lexicon, keys, ids, max_distance, prefix_length, transpositions)
+
+     # Load method
+     @classmethod
+     def load(cls, path, lexicon, max_distance=2, prefix_length=7, transpositions=True):
+          """Open the index at path, or build and save it if it is missing, stale or built with other settings."""
+          try:
+               index = cls.open(path, lexicon, transpositions)
+               if index.max_distance == max_distance and index.prefix_length == prefix_length:
+                    return index
+          except (OSError, ValueError):
+               pass  # Missing, corrupt, stale or from another index version
+          index = cls.build(lexicon, max_distance, prefix_length, transpositions)
+          try:
+               index.save(path)
+          except OSError:
+               pass  # Read-only directory: keep the index in memory only
+          return index
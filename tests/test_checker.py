@@ -0,0 +1,17 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Modules under test
+from checker import Checker
+from dawg import DAWG
+
+## ============================================================ ## CHECKER ## ============================================================ ##
+# Empty lexicon test
+def test_empty_lexicon_still_validates_through_the_analyzer():
+     checker = Checker(lexicon=DAWG.from_words(()))
+     assert len(checker.analyzer) == 0
+     assert checker.cache.lexicon is checker.analyzer
+
+# No morphology test
+def test_no_morphology_validates_against_the_layers():
+     checker = Checker(lexicon=DAWG.from_words(("bata",)), morphology=False)
+     assert checker.cache.lexicon is checker.layered
+     assert checker.is_valid("Bata") and not checker.is_valid("mga-bata")
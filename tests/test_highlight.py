@@ -0,0 +1,59 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Modules under test
+import highlight
+from highlight import HighlightLayer
+from incremental import DirtyRegionTracker
+
+## ============================================================ ## FAKE WIDGET ## ============================================================ ##
+# Records tag commands instead of drawing them
+class FakeText:
+     # Constructor
+     def __init__(self):
+          self.tk = self
+          self._w = ".text"
+          self.commands = []
+
+     # Tag config method
+     def tag_config(self, tag, **style):
+          pass
+
+     # Tag remove method
+     def tag_remove(self, tag, start, end):
+          self.commands.append(("remove", tag, start, end))
+
+     # Call method
+     def call(self, *args):
+          self.commands.append(args)
+
+## ============================================================ ## VIEWPORT PARTS ## ============================================================ ##
+# Flags method
+def flags(region):
+     """Words of three letters or fewer are the invalid ones."""
+     return [len(token.token) > 3 for token in region.words]
+
+# Parts test
+def test_parts_of_one_region_diff_the_text_once(monkeypatch):
+     text = "\n".join(f"ang bata ay kumain ng isda {i}" for i in range(1000))
+     whole = HighlightLayer(FakeText())
+     region = DirtyRegionTracker().diff(text)
+     whole.apply(region, flags(region))
+
+     calls = []
+     changed_lines = highlight.changed_lines
+     monkeypatch.setattr(highlight, "changed_lines", lambda old, new: calls.append(1) or changed_lines(old, new))
+     layer = HighlightLayer(FakeText())
+     parts = region.parts(100)
+     for part in reversed(parts):  # Any order, as when the viewport is checked first
+          layer.apply(part, flags(part))
+     assert len(calls) == 1
+     assert layer.ranges == whole.ranges
+     assert layer.count() == 4 * 1000
+
+     # An edit after the parts diffs again and keeps the other lines' highlights
+     edited = text.replace("ang bata ay kumain ng isda 500", "ang bata", 1)
+     tracker = DirtyRegionTracker()
+     tracker.commit(region)
+     update = tracker.diff(edited)
+     layer.apply(update, flags(update))
+     assert len(calls) == 2
+     assert layer.count() == 4 * 1000 - 3
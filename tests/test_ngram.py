@@ -0,0 +1,73 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Test modules
+import random
+
+# Modules under test
+from checker import Checker
+from dawg import DAWG
+from ngram import CONTEXT, NgramModel, sentences
+from tokenizer import tokenize
+
+# A tiny corpus in which "nang" follows "kumain" and "ng" comes before nouns
+WORDS = ("ako", "aklat", "bata", "kumain", "mabilis", "nang", "ng", "tumakbo", "bumili", "isda")
+CORPUS = ["kumain nang mabilis ang bata", "tumakbo nang mabilis ako", "bumili ng isda ang bata",
+          "bumili ng aklat ako", "kumain ng isda ako"] * 5
+
+## ============================================================ ## HELPERS ## ============================================================ ##
+# Model method
+def model():
+     lexicon = DAWG.from_words(WORDS + ("ang",))
+     return NgramModel.build(lexicon, CORPUS, threshold=0.1)
+
+# Run-on text method
+def run_on(count, seed=24):
+     """One line of count words and no sentence ends, with confusable words scattered through it."""
+     rng = random.Random(seed)
+     return " ".join(rng.choice(WORDS) for _ in range(count))
+
+## ============================================================ ## SENTENCE PIECES ## ============================================================ ##
+# Bounded buffer test
+def test_long_sentence_is_cut_into_bounded_overlapping_pieces():
+     tokens = list(tokenize(run_on(1000)))
+     pieces = list(sentences(iter(tokens), limit=50))
+     assert max(len(sentence) for sentence, start, stop in pieces) <= 50
+     # Every token is new in exactly one piece, in order, with CONTEXT words of context on either side
+     assert [token for sentence, start, stop in pieces for token in sentence[start:stop]] == tokens
+     for (sentence, start, stop), (following, *_) in zip(pieces, pieces[1:]):
+          assert stop == len(sentence) - CONTEXT
+          assert following[:2 * CONTEXT] == sentence[-2 * CONTEXT:]
+
+# Sentence end test
+def test_sentences_end_at_punctuation_and_line_breaks():
+     pieces = list(sentences(tokenize("Ako ay bata. Kumain ako\nng isda")))
+     assert [[token.token for token in sentence] for sentence, start, stop in pieces] == \
+          [["Ako", "ay", "bata."], ["Kumain", "ako"], ["ng", "isda"]]
+     assert all(start == 0 and stop == len(sentence) for sentence, start, stop in pieces)
+
+# Same results test
+def test_pieces_score_like_the_whole_sentence():
+     checker_model = model()
+     tokens = list(tokenize(run_on(2000)))
+     expected = checker_model.check(tokens)
+     assert expected  # The run-on text has real-word errors to find
+     assert checker_model.check_tokens(tokens) == expected
+     for limit in (5, 6, 17, 256):
+          replacements = {}
+          position = 0
+          for sentence, start, stop in sentences(tokens, limit):
+               for i, word in checker_model.check(sentence, start, stop).items():
+                    replacements[position + i - start] = word
+               position += stop - start
+          assert replacements == expected
+
+# Checker test
+def test_checker_reports_every_token_once_on_run_on_text():
+     checker_model = model()
+     checker = Checker(lexicon=checker_model.lexicon, morphology=False)
+     checker.context = checker_model
+     text = run_on(2000)
+     tokens = list(tokenize(text))
+     expected = checker_model.check(tokens)
+     results = list(checker.check_line(text))
+     assert [result["offset"] for result in results] == [token.start for token in tokens]
+     assert {i: result["context"] for i, result in enumerate(results) if "context" in result} == expected
@@ -0,0 +1,50 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Test modules
+import asyncio
+import json
+
+# Module under test
+from server import SpellCheckService
+
+## ============================================================ ## HELPERS ## ============================================================ ##
+# Exchange method
+async def exchange(service, raw):
+     """Send raw bytes to the service over a real socket and return (status, JSON body)."""
+     server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+     port = server.sockets[0].getsockname()[1]
+     async with server:
+          reader, writer = await asyncio.open_connection("127.0.0.1", port)
+          writer.write(raw)
+          await writer.drain()
+          response = await asyncio.wait_for(reader.read(), 5)
+          writer.close()
+     head, _, body = response.partition(b"\r\n\r\n")
+     return int(head.split()[1]), json.loads(body)
+
+# Service method
+def service(tmp_path):
+     dictionary = tmp_path / "words.txt"
+     dictionary.write_text("ako\nbata\nkumain\n", encoding="utf-8")
+     return SpellCheckService(str(dictionary), workers=0, morphology=False)
+
+## ============================================================ ## REQUEST FRAMING ## ============================================================ ##
+# Bad content length test
+def test_malformed_content_length_gets_400(tmp_path):
+     checker = service(tmp_path)
+     try:
+          for value in ("abc", "-5", "+3", "1_0", "٣"):
+               raw = f"POST /check HTTP/1.1\r\nContent-Length: {value}\r\n\r\n{{}}".encode("utf-8")
+               status, payload = asyncio.run(exchange(checker, raw))
+               assert status == 400, value
+               assert "Content-Length" in payload["error"]
+     finally:
+          checker.pool.shutdown()
+
+# Oversized body test
+def test_oversized_content_length_gets_413(tmp_path):
+     checker = service(tmp_path)
+     try:
+          status, payload = asyncio.run(exchange(checker, b"POST /check HTTP/1.1\r\nContent-Length: 99999999999\r\n\r\n"))
+          assert status == 413
+     finally:
+          checker.pool.shutdown()
@@ -0,0 +1,42 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Modules under test
+from dawg import DAWG
+from levenshtein import Suggester
+from symspell import SymSpellIndex
+from tokenizer import normalize_word
+
+# Words with accents and both apostrophes, next to their plain neighbours
+WORDS = ("biñan", "bilang", "binaba", "binago", "bayan", "parañaque", "paraan", "ito", "ito'y", "ito’y", "iyo'y",
+         "dito'y", "kanya'y", "kanya’y", "ganya'y", "kanyang", "amoy", "apoy", "niño", "nino")
+
+# Queries arrive folded, as the tokenizer leaves them
+QUERIES = ("binann", "binan", "paranaqe", "itoy", "ito'y", "ito’y", "kanyay", "kanya'y", "nino", "ninyo", "apoi")
+
+## ============================================================ ## BACKENDS ## ============================================================ ##
+# Backends method
+def backends():
+     lexicon = DAWG.from_words(WORDS)
+     return Suggester(lexicon), SymSpellIndex.build(lexicon, prefix_length=4)
+
+# Same suggestions test
+def test_backends_agree_on_accented_and_apostrophe_queries():
+     automaton, symspell = backends()
+     for query in QUERIES:
+          word = normalize_word(query)
+          assert sorted(symspell.candidates(word)) == sorted(automaton.candidates(word)), query
+          assert symspell.suggest(word) == automaton.suggest(word), query
+
+# Folded match test
+def test_accented_words_match_their_folded_queries():
+     for suggester in backends():
+          assert suggester.suggest("binann")[0] == ("biñan", 1)
+          assert suggester.suggest("paranaqe") == [("parañaque", 1)]
+          assert suggester.suggest("binan", n=1) == [("biñan", 0)]
+
+# One slot per key test
+def test_each_folded_key_takes_one_slot():
+     for suggester in backends():
+          words = [word for word, distance in suggester.suggest("kanyay")]
+          assert words.count("kanya'y") + words.count("kanya’y") == 1
+          keys = [normalize_word(word) for word, distance in suggester.suggest("itoy", n=10)]
+          assert len(keys) == len(set(keys))
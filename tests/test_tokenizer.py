@@ -0,0 +1,55 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Test modules
+import random
+import time
+
+# Module under test
+from tokenizer import tokenize, tokenize_stream
+
+# Text with words split at every kind of boundary: hyphens, apostrophes, accents, blank lines and trailing spaces
+SAMPLE = ("Ang mag-aaral ay pumasok sa paaralan ng Biñan.\n"
+          "Ito’y   aklat ni Juan, at kanya'y lapis.\n\n"
+          "\tSiya ay  nag-aral... Talaga?!  \n"
+          "ÑAÑO naku — hindi!\n")
+
+## ============================================================ ## STREAM TOKENIZER ## ============================================================ ##
+# Split method
+def split(text, rng):
+     """Cut text into chunks of random sizes (empty chunks included)."""
+     chunks = []
+     position = 0
+     while position < len(text):
+          size = rng.randint(0, 12)
+          chunks.append(text[position:position + size])
+          position += size
+     return chunks
+
+# Random chunking test
+def test_stream_matches_whole_text_for_any_chunking():
+     rng = random.Random(20)
+     expected = list(tokenize(SAMPLE * 3))
+     for _ in range(500):
+          assert list(tokenize_stream(split(SAMPLE * 3, rng))) == expected
+
+# Position arguments test
+def test_stream_keeps_the_starting_position():
+     expected = list(tokenize(SAMPLE, line=7, offset=100))
+     assert list(tokenize_stream(split(SAMPLE, random.Random(1)), line=7, offset=100)) == expected
+
+# Long run test
+def test_long_unbroken_run_is_linear():
+     text = "a" * 200000
+     chunks = [text[i:i + 100] for i in range(0, len(text), 100)]
+     started = time.perf_counter()
+     tokens = list(tokenize_stream(chunks + [" b"], max_token=len(text)))
+     assert time.perf_counter() - started < 2.0
+     assert [(token.token, token.start, token.end) for token in tokens] == [(text, 0, len(text)), ("b", len(text) + 1, len(text) + 2)]
+
+# Max token test
+def test_long_run_is_emitted_in_pieces_past_max_token():
+     text = "a" * 1000 + " b"
+     chunks = [text[i:i + 100] for i in range(0, len(text), 100)]
+     tokens = list(tokenize_stream(chunks, max_token=250))
+     assert "".join(token.token for token in tokens[:-1]) == "a" * 1000
+     assert all(len(token.token) <= 350 for token in tokens)
+     assert tokens[-1].token == "b" and tokens[-1].start == 1001
@@ -0,0 +1,139 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Regular expression and Unicode modules
+import re
+import unicodedata
+
+# Named tuple for tokens
+from collections import namedtuple
+
+## ============================================================ ## PATTERNS ## ============================================================ ##
+# Whitespace-delimited tokens, the same units that str.split() produces
+TOKEN_PATTERN = re.compile(r"\S+")
+
+## ============================================================ ## FOLDING ## ============================================================ ##
+# Apostrophe and hyphen variants, unified to ' and - so every way of typing ako’y or mag-aaral meets the same key
+APOSTROPHES = "'’‘ʼ`´′ʹ＇"
+HYPHENS = "-‐‑‒–—―−﹣－"
+
+# str.translate table that folds a character the first time it is seen
+#
+# Letters are lowercased and decomposed (NFKD) with their combining marks
+# dropped, so ñ, Ñ and n + U+0303 all become n; apostrophe and hyphen variants
+# are unified; every other character that is not a word character is deleted,
+# as the old cleaning regex did. Deletions map to None so ASCII text stays on
+# CPython's cached translate path.
+class FoldTable(dict):
+     # Missing method
+     def __missing__(self, ordinal):
+          char = chr(ordinal)
+          if char in APOSTROPHES:
+               folded = "'"
+          elif char in HYPHENS:
+               folded = "-"
+          else:
+               folded = "".join(part for part in unicodedata.normalize("NFKD", char.lower())
+                                if part.isalnum() or part == "_") or None
+          self[ordinal] = folded
+          return folded
+
+# Shared by every caller; filled in lazily, one entry per distinct character
+FOLD_TABLE = FoldTable()
+
+# Normalize word method
+def normalize_word(word):
+     """Return the folded lookup key of a token: one translate pass, no regex."""
+     return word.translate(FOLD_TABLE)
+
+# Fold aliases method
+def fold_aliases(words):
+     """Return {folded key: word} for the words whose folded key is not a word of the list itself.
+
+     If several words fold to the same key, the first in sorted order wins."""
+     words = set(words)
+     aliases = {}
+     for word in sorted(words):
+          key = normalize_word(word)
+          if key and key != word and key not in words:
+               aliases.setdefault(key, word)
+     return aliases
+
+## ============================================================ ## TOKEN CLASS ## ============================================================ ##
+# A token with its normalized form, character offsets and 1-based line / 0-based column
+class Token(namedtuple("Token", "token normalized start end line col")):
+     __slots__ = ()
+
+     # Start index property
+     @property
+     def start_index(self):
+          """Tk text index of the first character."""
+          return f"{self.line}.{self.col}"
+
+     # End index property
+     @property
+     def end_index(self):
+          """Tk text index just past the last character."""
+          return f"{self.line}.{self.col + len(self.token)}"
+
+## ============================================================ ## TOKENIZER ## ============================================================ ##
+# Tokenize method
+def tokenize(text, line=1, offset=0, normalize=normalize_word, col=0):
+     """Yield a Token for every word of text in one left-to-right pass.
+
+     line, offset and col give the position of text within a larger document,
+     so a single line, region or stream chunk can be tokenized with document
+     coordinates. Lines are tracked by counting newlines in the gaps between
+     tokens, so every character is looked at once."""
+     line_start = -col
+     position = 0
+     for match in TOKEN_PATTERN.finditer(text):
+          start = match.start()
+          newlines = text.count("\n", position, start)
+          if newlines:
+               line += newlines
+               line_start = text.rfind("\n", position, start) + 1
+          position = match.end()
+          word = match.group()
+          yield Token(word, normalize(word), offset + start, offset + position, line, start - line_start)
+
+# Tokenize stream method
+def tokenize_stream(chunks, line=1, offset=0, normalize=normalize_word, max_token=1 << 16):
+     """Yield a Token for every word of an iterable of text chunks, using memory bounded by the chunk size.
+
+     A word that runs up to the end of a chunk is held back and joined with
+     the start of the next chunk, so a word split across chunks comes out
+     whole and is cleaned like any other (hyphens and apostrophes included).
+     A run of more than max_token characters without whitespace is emitted
+     in pieces rather than buffered without limit."""
+     carry = []  # Pieces of the word running up to the end of the last chunk
+     carry_size = 0
+     col = 0  # Column of the first character of carry (or of the next chunk)
+     for chunk in chunks:
+          if not chunk:
+               continue
+          # Only the new chunk is searched, backwards from its end, so every character is scanned once
+          cut = len(chunk)
+          while cut and not chunk[cut - 1].isspace():
+               cut -= 1
+          tail_size = len(chunk) - cut + (carry_size if cut == 0 else 0)
+          if tail_size <= max_token:
+               if cut == 0:
+                    carry.append(chunk)  # No whitespace: the word goes on
+                    carry_size += len(chunk)
+                    continue
+               head, tail = "".join(carry) + chunk[:cut], chunk[cut:]
+          else:
+               head, tail = "".join(carry) + chunk, ""  # Too long to hold back: emit it as it stands
+          yield from tokenize(head, line, offset, normalize, col)
+          carry = [tail] if tail else []
+          carry_size = len(tail)
+
+          # Move the position past the emitted text
+          newlines = head.count("\n")
+          if newlines:
+               line += newlines
+               col = len(head) - head.rfind("\n") - 1
+          else:
+               col += len(head)
+          offset += len(head)
+     if carry:
+          yield from tokenize("".join(carry), line, offset, normalize, col)
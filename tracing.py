@@ -0,0 +1,111 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Output modules
+import atexit
+import json
+import time
+
+# Trace levels
+TRACE_OFF = "off"
+TRACE_BUFFERED = "buffered"
+TRACE_STRUCTURED = "structured"
+
+## ============================================================ ## EVENT FORMATTING ## ============================================================ ##
+# Format event method
+def format_event(event, fields):
+     """Render an FSM event the way the terminal pane has always shown it."""
+     if event == "transition":
+          text = f"[TRANSITION]: {fields['source']} -> {fields['target']}\n"
+          return "\n" + text if fields["source"] == "Start" else text
+     if event == "result":
+          return f"[RESULTING STATE]: {fields['state']}\n[WORD]: {fields['word']}\n"
+     if event == "analysis":
+          return f"[ROOT]: {fields['analysis']}\n"
+     return f"[{event.upper()}]: {fields}\n"
+
+## ============================================================ ## TRACE SINKS ## ============================================================ ##
+# Tracing disabled: callers check `enabled` first, so no event is ever built or formatted
+class NullSink:
+     enabled = False
+
+     # Emit method
+     def emit(self, event, **fields):
+          pass
+
+     # Flush method
+     def flush(self):
+          pass
+
+     # Close method
+     def close(self):
+          pass
+
+# Collects formatted events and writes them in one batch at most every interval_ms
+class BufferedSink:
+     enabled = True
+
+     # Constructor
+     def __init__(self, write, schedule=None, interval_ms=100):
+          self.write = write  # Called once per flush with all pending text
+          self.schedule = schedule  # after()-style callable; without it, call flush() yourself
+          self.interval_ms = interval_ms
+          self.pending = []
+          self.scheduled = False
+
+     # Emit method
+     def emit(self, event, **fields):
+          self.pending.append(format_event(event, fields))
+          if self.schedule is not None and not self.scheduled:
+               self.scheduled = True
+               self.schedule(self.interval_ms, self._scheduled_flush)
+
+     # Scheduled flush method
+     def _scheduled_flush(self):
+          self.scheduled = False
+          self.flush()
+
+     # Flush method
+     def flush(self):
+          if self.pending:
+               text = "".join(self.pending)
+               self.pending = []
+               self.write(text)
+
+     # Close method
+     def close(self):
+          self.flush()
+
+# Writes every event as one JSON object per line to a file
+class JSONLinesSink:
+     enabled = True
+
+     # Constructor
+     def __init__(self, path):
+          self.file = open(path, "a", encoding="utf-8", buffering=1 << 16)
+          atexit.register(self.close)
+
+     # Emit method
+     def emit(self, event, **fields):
+          record = {"time": time.time(), "event": event}
+          record.update(fields)
+          self.file.write(json.dumps(record, ensure_ascii=False))
+          self.file.write("\n")
+
+     # Flush method
+     def flush(self):
+          if not self.file.closed:
+               self.file.flush()
+
+     # Close method
+     def close(self):
+          if not self.file.closed:
+               self.file.close()
+
+## ============================================================ ## SINK FACTORY ## ============================================================ ##
+# Make sink method
+def make_sink(level, write=None, schedule=None, path="fsm_trace.jsonl", interval_ms=100):
+     """Return the sink for a trace level (off, buffered or structured)."""
+     if level == TRACE_BUFFERED and write is not None:
+          return BufferedSink(write, schedule, interval_ms)
+     if level == TRACE_STRUCTURED:
+          return JSONLinesSink(path)
+     return NullSink()
@@ -0,0 +1,181 @@
+## ============================================================ ## MODULES ## ============================================================ ##
+# Thread, queue and timing modules
+import queue
+import threading
+import time
+
+# Logging module
+import logging
+
+# Per-stage timers (off unless enabled)
+from profiling import profiler
+
+## ============================================================ ## CHECK WORKER CLASS ## ============================================================ ##
+# Runs validation and suggestion lookups off the Tk main thread
+#
+# Requests are numbered per kind ("check" or "suggest"). Submitting a new request
+# makes every older request of the same kind stale: stale requests are dropped
+# before they start, abandoned while running, and their results are never
+# delivered. The worker never touches Tk; the GUI collects finished results with
+# poll() from an after() callback and applies them on the main thread.
+#
+# A check result is (region, flags, done, hints), where hints maps the index of
+# a dictionary word that another word fits better in context to that word
+# (empty without a context checker). Regions longer than part_lines are
+# delivered in parts: the part nearest the viewport the GUI last reported goes
+# first, so the visible text is highlighted within a poll or two, and the rest
+# follows in the background, again nearest-first, so scrolling to a new place
+# pulls it forward. Only the last part has done set; the GUI commits the region
+# then, so a check cancelled half-way is simply diffed again next time.
+class CheckWorker:
+     # Constructor
+     def __init__(self, tracker, is_valid, get_suggestions, part_lines=100, margin=50, context=None):
+          self.tracker = tracker  # DirtyRegionTracker, only mutated on this worker's thread
+          self.is_valid = is_valid
+          self.get_suggestions = get_suggestions
+          self.context = context  # Optional callable: list of Tokens -> {index: replacement}
+          self.part_lines = part_lines
+          self.margin = margin  # Lines above and below the viewport that count as visible
+          self.viewport = (1, 1)  # First and last visible line, set by the GUI
+          self.requests = queue.Queue()
+          self.results = queue.Queue()
+          self.latest = {"check": 0, "suggest": 0}
+          self.lock = threading.Lock()
+          self.thread = threading.Thread(target=self._run, name="CheckWorker", daemon=True)
+          self.thread.start()
+
+     # Submit method
+     def submit(self, kind, payload):
+          """Queue a request and cancel the older requests of the same kind."""
+          with self.lock:
+               self.latest[kind] += 1
+               generation = self.latest[kind]
+          self.requests.put((kind, generation, payload))
+          return generation
+
+     # Commit method
+     def commit(self, region):
+          """Tell the worker that the GUI applied a region, so the next diff starts from it."""
+          self.requests.put(("commit", 0, region))
+
+     # Reset method
+     def reset(self):
+          """Forget the applied text, so the next check covers the whole document."""
+          self.requests.put(("reset", 0, None))
+
+     # Set viewport method
+     def set_viewport(self, first_line, last_line):
+          """Record the visible lines, so they are checked before the rest of a large region."""
+          self.viewport = (first_line, last_line)  # One assignment, read by the worker thread
+
+     # Is current method
+     def is_current(self, kind, generation):
+          with self.lock:
+               return self.latest[kind] == generation
+
+     # Poll method
+     def poll(self):
+          """Return the finished (kind, result) pairs that are still current (call from the Tk thread)."""
+          finished = []
+          while True:
+               try:
+                    kind, generation, result = self.results.get_nowait()
+               except queue.Empty:
+                    return finished
+               if self.is_current(kind, generation):
+                    finished.append((kind, result))
+
+     # Stop method
+     def stop(self):
+          self.requests.put(("stop", 0, None))
+
+     # Run method
+     def _run(self):
+          while True:
+               kind, generation, payload = self.requests.get()
+               if kind == "stop":
+                    return
+               if kind == "commit":
+                    self.tracker.commit(payload)
+                    continue
+               if kind == "reset":
+                    self.tracker.reset()
+                    continue
+               if not self.is_current(kind, generation):
+                    continue  # Cancelled before it started
+               try:
+                    if kind == "check":
+                         results = self._check(generation, payload)
+                    else:
+                         if profiler.enabled:
+                              started = time.perf_counter_ns()
+                         results = [(payload, self.get_suggestions(payload))]
+                         if profiler.enabled:
+                              profiler.record("suggest", started)
+                    for result in results:
+                         if not self.is_current(kind, generation):
+                              break
+                         self.results.put((kind, generation, result))
+               except Exception as e:
+                    logging.error(f"Error in background {kind}: {e}")
+
+     # Check method
+     def _check(self, generation, content):
+          """Diff a text snapshot against the last applied pass and yield the validated region or its parts."""
+          if profiler.enabled:
+               started = time.perf_counter_ns()
+          region = self.tracker.diff(content)
+          parts = region.parts(self.part_lines)
+          if profiler.enabled:
+               profiler.record("diff", started)
+          if len(parts) <= 1:
+               flags = self._validate(generation, region)
+               if flags is not None:
+                    yield region, flags, True, self._context(region)
+               return
+
+          # Large region: deliver it part by part, nearest to the viewport first
+          while parts:
+               first, last = self.viewport
+               top, bottom = first - self.margin, last + self.margin
+               part = min(parts, key=lambda part: max(top - part.last_line, part.first_line - bottom, 0))
+               parts.remove(part)
+               flags = self._validate(generation, part)
+               if flags is None:
+                    return
+               yield part, flags, not parts, self._context(part)
+               if part.last_line < top or part.first_line > bottom:
+                    time.sleep(0)  # Off-screen fill-in: let the Tk thread run between parts
+
+     # Validate method
+     def _validate(self, generation, region):
+          if profiler.enabled:
+               started = time.perf_counter_ns()
+          words = region.words  # Tokenized (and normalized) on first use
+          if profiler.enabled:
+               profiler.record("tokenize", started)
+               started = time.perf_counter_ns()
+          flags = []
+          for count, token in enumerate(words):
+               # Give up early if the user kept typing
+               if count % 1000 == 999 and not self.is_current("check", generation):
+                    return None
+               flags.append(self.is_valid(token.token))
+          if profiler.enabled:
+               profiler.record("lookup", started)
+               profiler.count("words checked", len(flags))
+               profiler.count("invalid", flags.count(False))
+          return flags
+
+     # Context method
+     def _context(self, region):
+          """Score the words of a region in context; parts end at line breaks, which also end sentences."""
+          if self.context is None:
+               return {}
+          if profiler.enabled:
+               started = time.perf_counter_ns()
+          hints = self.context(region.words)
+          if profiler.enabled:
+               profiler.record("context", started)
+               profiler.count("context errors", len(hints))
+          return hints